@@ -3,7 +3,7 @@
 import os
 from io import BytesIO
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, List, Tuple, Union
 
 import matplotlib
 matplotlib.use("Agg")
@@ -15,7 +15,8 @@ from sklearn.metrics import accuracy_score
 from sklearn.preprocessing import StandardScaler
 
 
-from flame.star import StarModel, StarAnalyzer, StarAggregator
+from flame.utils.codec import NumpyCodec
+from flame.star import StarModel, StarAnalyzer, FedAvgAggregator
 
 
 # ---------------------------------------------------------------------------
@@ -104,10 +105,13 @@ class Analyzer(StarAnalyzer):
     def __init__(self, flame):
         super().__init__(flame)
 
-    def analysis_method(self, data, aggregator_results):
-        # --- Parse CSV bytes ------------------------------------------------
+    def prepare(self, data):
+        # --- Parse CSV bytes (once, reused in every iteration) --------------
         file_bytes = [v for k, v in data[0].items() if k.endswith('labeled.csv')][0]
-        df = pd.read_csv(BytesIO(file_bytes))
+        return pd.read_csv(BytesIO(file_bytes))
+
+    def analysis_method(self, data, aggregator_results):
+        df = data
         node_id = getattr(self, "id", "unknown")
 
 
@@ -184,10 +188,10 @@ class Analyzer(StarAnalyzer):
             "sex_counts": sex_counts,
             "pasc_counts": pasc_counts,
             "feature_names": feature_names,
-            "svm_coef": svm.coef_.tolist(),
-            "svm_intercept": svm.intercept_.tolist(),
-            "scaler_mean": scaler.mean_.tolist(),
-            "scaler_scale": scaler.scale_.tolist(),
+            "svm_coef": svm.coef_,
+            "svm_intercept": svm.intercept_,
+            "scaler_mean": scaler.mean_,
+            "scaler_scale": scaler.scale_,
             "local_accuracy": local_acc,
             "local_n_samples": int(len(y)),
         }
@@ -197,14 +201,16 @@ class Analyzer(StarAnalyzer):
 # Aggregator  (central coordinator)
 # ---------------------------------------------------------------------------
 
-class Aggregator(StarAggregator):
+class Aggregator(FedAvgAggregator):
     """
     Aggregates descriptive statistics, generates plots, and performs
     federated averaging of the SVM weights across nodes.
     """
 
     def __init__(self, flame):
-        super().__init__(flame)
+        super().__init__(flame,
+                         parameter_keys=["svm_coef", "svm_intercept"],
+                         weight_key="local_n_samples")
 
     # --- main aggregation ---------------------------------------------------
 
@@ -242,18 +248,9 @@ class Aggregator(StarAggregator):
 
         # Federated SVM averaging (weighted by node sample size)
         total_samples = sum(r["local_n_samples"] for r in analysis_results)
-        coef_avg: Optional[np.ndarray] = None
-        intercept_avg: Optional[np.ndarray] = None
-        for r in analysis_results:
-            w = r["local_n_samples"] / total_samples
-            coef = np.array(r["svm_coef"])
-            intercept = np.array(r["svm_intercept"])
-            if coef_avg is None:
-                coef_avg = w * coef
-                intercept_avg = w * intercept
-            else:
-                coef_avg += w * coef
-                intercept_avg += w * intercept
+        svm_avg = self.federated_average(analysis_results)
+        coef_avg = svm_avg["svm_coef"]
+        intercept_avg = svm_avg["svm_intercept"]
 
         avg_accuracy = sum(
             r["local_accuracy"] * r["local_n_samples"] for r in analysis_results
@@ -292,8 +289,8 @@ class Aggregator(StarAggregator):
             "age_hist": age_hist,
             "sex_counts": sex_counts,
             "pasc_counts": pasc_counts,
-            "svm_coef": coef_avg.tolist(),
-            "svm_intercept": intercept_avg.tolist(),
+            "svm_coef": coef_avg,
+            "svm_intercept": intercept_avg,
             "avg_accuracy": avg_accuracy,
             "per_node": per_node,
             "iteration": self.num_iterations,
@@ -484,6 +481,7 @@ if __name__ == "__main__":
         query=[],
         multiple_results=True,
         simple_analysis=False,
-        output_type=['bytes', 'str', 'bytes', 'bytes']
+        output_type=['bytes', 'str', 'bytes', 'bytes'],
+        codec=NumpyCodec()  # Ship numpy weights as raw buffers
     )
 
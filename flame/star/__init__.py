@@ -1,5 +1,9 @@
 from flame.star.star_model import StarModel
 from flame.star.star_localdp.star_localdp_model import StarLocalDPModel
+from flame.star.star_async.star_async_model import AsyncStarModel
+from flame.star.star_tree.star_tree_model import StarTreeModel
 from flame.star.analyzer_client import Analyzer as StarAnalyzer
 from flame.star.aggregator_client import Aggregator as StarAggregator
+from flame.star.fedavg_aggregator import FedAvgAggregator
 from flame.star.star_model_tester import StarModelTester
+from flame.star.star_model_sweep import StarModelSweep, SweepResults
@@ -1,24 +1,80 @@
 from abc import abstractmethod
-from typing import Any, Optional, Union
+from typing import Any, Iterable, Optional, Union
 
 from flamesdk import FlameCoreSDK
-from flame.star.node_base_client import Node
+from flame.star.node_base_client import Node, _run_hook
 from flame.utils.mock_flame_core import MockFlameCoreSDK
 
 
 class Aggregator(Node):
     delta_criteria: bool = False
+    incremental_aggregation: bool = False
+    contributor_ids: list[str]
 
     def __init__(self, flame: Union[FlameCoreSDK, MockFlameCoreSDK]) -> None:
         super().__init__(flame)
         if self.role != 'aggregator':
             raise ValueError(f'Attempted to initialize aggregator node with mismatching configuration '
                              f'(expected: node_role="aggregator", received="{self.role}").')
+        self.contributor_ids = list(self.partner_node_ids)
 
-    def aggregate(self, node_results: list[Any], simple_analysis: bool = True) -> tuple[Any, bool]:
-        result = self.aggregation_method(node_results)
+    def aggregate(self,
+                  node_results: list[Any],
+                  simple_analysis: bool = True,
+                  contributor_ids: Optional[list[str]] = None) -> tuple[Any, bool]:
+        self.contributor_ids = list(self.partner_node_ids) if contributor_ids is None else contributor_ids
+        with self.timer.phase('aggregation'):
+            result = self.aggregation_method(node_results)
 
-        self.delta_criteria = self.has_converged(result, self.latest_result)
+        return self._register_result(result, simple_analysis)
+
+    async def aggregate_async(self,
+                              node_results: list[Any],
+                              simple_analysis: bool = True,
+                              contributor_ids: Optional[list[str]] = None) -> tuple[Any, bool]:
+        # aggregation_method may be a coroutine function, a synchronous one is run in a worker thread
+        self.contributor_ids = list(self.partner_node_ids) if contributor_ids is None else contributor_ids
+        with self.timer.phase('aggregation'):
+            result = await _run_hook(self.aggregation_method, node_results)
+
+        return self._register_result(result, simple_analysis)
+
+    def aggregate_incrementally(self,
+                                node_results: Iterable[Any],
+                                simple_analysis: bool = True,
+                                contributor_ids: Optional[list[str]] = None) -> tuple[Any, bool]:
+        # contributor_ids may be filled while node_results is being consumed
+        self.contributor_ids = list(self.partner_node_ids) if contributor_ids is None else contributor_ids
+        with self.timer.phase('aggregation'):
+            partial_result = self.init_aggregation()
+        for node_result in node_results:  # (awaits results as they arrive)
+            with self.timer.phase('aggregation'):
+                partial_result = self.accumulate(partial_result, node_result)
+            del node_result  # release the result before awaiting the next one
+        with self.timer.phase('aggregation'):
+            result = self.finalize_aggregation(partial_result)
+
+        return self._register_result(result, simple_analysis)
+
+    def merge_partial_results(self, partial_result: Any, partial_results: Iterable[Any]) -> Any:
+        # fold partial results of subtrees into partial_result (tree aggregation)
+        for other_partial_result in partial_results:
+            with self.timer.phase('aggregation'):
+                partial_result = self.merge_states(partial_result, other_partial_result)
+        return partial_result
+
+    def aggregate_partial_results(self,
+                                  partial_results: Iterable[Any],
+                                  simple_analysis: bool = True) -> tuple[Any, bool]:
+        partial_result = self.merge_partial_results(self.init_aggregation(), partial_results)
+        with self.timer.phase('aggregation'):
+            result = self.finalize_aggregation(partial_result)
+
+        return self._register_result(result, simple_analysis)
+
+    def _register_result(self, result: Any, simple_analysis: bool) -> tuple[Any, bool]:
+        with self.timer.phase('convergence_check'):
+            self.delta_criteria = self.has_converged(result, self.latest_result)
         if not simple_analysis:
             converged = self.delta_criteria if self.num_iterations != 0 else False
         else:
@@ -33,10 +89,49 @@ class Aggregator(Node):
     def aggregation_method(self, analysis_results: list[Any]) -> Any:
         """
         This method will be used to aggregate the data. It has to be overwritten.
+
+        The ids of the analyzer nodes, whose results are aggregated in the current round, are available in
+        self.contributor_ids (in the same order as analysis_results). When run by an AsyncStarModel, it may also be
+        implemented as coroutine function (async def).
+
+        In asynchronous mode (max_staleness set in the StarModel), analysis_results only contains the results arrived
+        since the previous update, which should be merged into the previous aggregated result (self.latest_result).
         :return: aggregated_result
         """
         pass
 
+    def init_aggregation(self) -> Any:
+        """
+        This method will be used to initialize the partial result of an incremental aggregation. It has to be
+        overwritten, if incremental_aggregation is set to True (replaces aggregation_method).
+        :return: initial partial_result
+        """
+        raise NotImplementedError("Incremental aggregation requires init_aggregation to be overwritten.")
+
+    def accumulate(self, partial_result: Any, analysis_result: Any) -> Any:
+        """
+        This method will be used to fold a single analysis result into the partial result, as soon as it arrives at
+        the aggregator. It has to be overwritten, if incremental_aggregation is set to True.
+        :return: updated partial_result
+        """
+        raise NotImplementedError("Incremental aggregation requires accumulate to be overwritten.")
+
+    def merge_states(self, partial_result: Any, other_partial_result: Any) -> Any:
+        """
+        This method will be used to merge two partial results, each accumulated from the analysis results of a
+        different set of analyzers. It has to be overwritten for tree aggregation (see StarTreeModel).
+        :return: merged partial_result
+        """
+        raise NotImplementedError("Tree aggregation requires merge_states to be overwritten.")
+
+    def finalize_aggregation(self, partial_result: Any) -> Any:
+        """
+        This method will be used to compute the aggregated result once all analysis results have been accumulated.
+        It may be overwritten, and returns the partial result unchanged by default.
+        :return: aggregated_result
+        """
+        return partial_result
+
     @abstractmethod
     def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
         """
@@ -2,36 +2,132 @@ from abc import abstractmethod
 from typing import Any, Optional, Union
 
 from flamesdk import FlameCoreSDK
-from flame.star.node_base_client import Node
+from flame.star.node_base_client import Node, _run_hook
+from flame.utils.data_summary import estimate_size
 from flame.utils.mock_flame_core import MockFlameCoreSDK
 
 
 class Analyzer(Node):
+    prepared_data: Optional[Any]
+    local_steps: int = 1
+    local_step: int
 
     def __init__(self, flame: Union[FlameCoreSDK, MockFlameCoreSDK]) -> None:
         super().__init__(flame)
         if self.role != 'default':
             raise ValueError(f'Attempted to initialize analyzer node with mismatching configuration '
                              f'(expected: node_mode="default", received="{self.role}").')
+        self.prepared_data = None
+        self._is_prepared = False
+        self._prepared_data_size: Optional[int] = None
+        self.local_step = 0
 
     def analyze(self, data: list[Any]) -> Any:
-        result = self.analysis_method(data, self.latest_result)
+        if not self._is_prepared:
+            with self.timer.phase('preparation'):
+                self._cache_prepared_data(self.prepare(data))
+        # run local steps, each continuing from the result of the previous one
+        result = self.latest_result
+        with self.timer.phase('analysis'):
+            for step in range(self._num_local_steps()):
+                self.local_step = step
+                result = self.analysis_method(self.prepared_data, result)
 
+        return self._register_result(result)
+
+    async def analyze_async(self, data: list[Any]) -> Any:
+        # prepare and analysis_method may be coroutine functions, synchronous ones are run in a worker thread
+        if not self._is_prepared:
+            with self.timer.phase('preparation'):
+                self._cache_prepared_data(await _run_hook(self.prepare, data))
+        result = self.latest_result
+        with self.timer.phase('analysis'):
+            for step in range(self._num_local_steps()):
+                self.local_step = step
+                result = await _run_hook(self.analysis_method, self.prepared_data, result)
+
+        return self._register_result(result)
+
+    def _num_local_steps(self) -> int:
+        num_steps = self.schedule_local_steps(self.num_iterations)
+        if num_steps < 1:
+            raise ValueError(f"Number of local steps must be at least 1 (given: {num_steps} in round "
+                             f"{self.num_iterations}).")
+        return num_steps
+
+    def _cache_prepared_data(self, prepared_data: Any) -> None:
+        self.prepared_data = prepared_data
+        self._is_prepared = True
+        if type(self).prepare is not Analyzer.prepare:
+            # the size is only estimated on access of prepared_data_size, as estimating it traverses the whole data
+            self.flame.flame_log("\tPrepared data cached", log_type='info')
+
+    def _register_result(self, result: Any) -> Any:
         self.latest_result = result
         self.num_iterations += 1
 
         return self.latest_result
 
+    @property
+    def prepared_data_size(self) -> int:
+        """
+        Estimated memory footprint of the cached prepared data in bytes.
+        """
+        if self._prepared_data_size is None:
+            self._prepared_data_size = estimate_size(self.prepared_data) if self._is_prepared else 0
+        return self._prepared_data_size
+
+    def invalidate_prepared_data(self) -> None:
+        """
+        Drop the cached prepared data, such that prepare is executed again before the next analysis.
+        """
+        self.prepared_data = None
+        self._is_prepared = False
+        self._prepared_data_size = None
+
+    def prepare(self, data: list[Any]) -> Any:
+        """
+        This method will be executed once before the first analysis, and its output is cached and passed to every
+        subsequent call of analysis_method instead of the raw data (e.g. to parse datasets only once in iterative
+        analyses). It may be overwritten, and returns the data unchanged by default.
+
+        Use invalidate_prepared_data to execute it again before the next analysis. When run by an AsyncStarModel, it
+        may also be implemented as coroutine function (async def).
+        :return: prepared_data
+        """
+        return data
+
+    def schedule_local_steps(self, num_iterations: int) -> int:
+        """
+        This method determines the number of local steps (i.e. calls of analysis_method) run before sending the
+        analysis result of a round to the aggregator. It may be overwritten to schedule local steps per round, e.g.
+        increasing them as convergence nears to save round trips, and returns local_steps by default.
+        :param num_iterations: number of rounds completed by this analyzer
+        :return: number of local steps
+        """
+        return self.local_steps
+
     @abstractmethod
     def analysis_method(self, data: list[Any], aggregator_results: Optional[Any]) -> Any:
         """
         This method will be used to analyze the data. It has to be overwritten.
 
-        The parameter data will be formatted like this:
+        If prepare is overwritten, the parameter data will be its (cached) output. Otherwise, it will be formatted like
+        this:
             [list element for every registered data source
                 {query: dict for fhir, or str for s3}
             ]
+        If lazy_data is set in the StarModel, data is given as a LazyNodeData view in the same format, which retrieves
+        datasets only when accessed (see LazyNodeData.iter_datasets for streaming through them one key at a time).
+        If mmap_s3_data is set, s3 datasets are given as memory-mapped memoryviews instead of bytes (e.g. use
+        flame.utils.mapped_data.as_file to read them with pandas without copying, or numpy.frombuffer).
+
+        With several local steps per round (see local_steps and schedule_local_steps), aggregator_results is the latest
+        aggregated result in the first step (self.local_step == 0), and the result of the previous step afterwards.
+        Only the result of the last step is sent to the aggregator.
 
+        When run by an AsyncStarModel, it may also be implemented as coroutine function (async def), e.g. to await
+        requests of the SDK's asynchronous data client.
         :return: analysis_result
         """
         pass
@@ -0,0 +1,112 @@
+from typing import Any, Optional, Union
+
+from flamesdk import FlameCoreSDK
+from flame.star.aggregator_client import Aggregator
+from flame.utils.mock_flame_core import MockFlameCoreSDK
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class FedAvgAggregator(Aggregator):
+    """
+    Aggregator computing the federated average (FedAvg) of model parameters, weighted by the number of samples of
+    each analyzer.
+
+    Analysis results have to be dictionaries containing the parameters (numpy arrays, array-likes, or dictionaries of
+    named arrays) and the number of samples under weight_key. The parameters to average are given by parameter_keys,
+    or are all numpy arrays and dictionaries of numpy arrays in the results by default. Every parameter is averaged
+    with a single reduction over the parameters of all analyzers, which are stacked into a buffer reused across
+    rounds. Floating point dtypes are preserved, other dtypes are averaged as float64.
+
+    By default, aggregation_method returns the averaged parameters. Overwrite it and call federated_average to
+    aggregate further statistics alongside.
+    """
+    parameter_keys: Optional[list[str]]
+    weight_key: Optional[str]
+
+    def __init__(self,
+                 flame: Union[FlameCoreSDK, MockFlameCoreSDK],
+                 parameter_keys: Optional[list[str]] = None,
+                 weight_key: Optional[str] = 'n_samples') -> None:
+        if np is None:
+            raise ImportError("FedAvgAggregator requires numpy to be installed.")
+        super().__init__(flame)
+        self.parameter_keys = parameter_keys
+        self.weight_key = weight_key
+        self._stack_buffers: dict[tuple[str, ...], np.ndarray] = {}
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        return self.federated_average(analysis_results)
+
+    def federated_average(self, analysis_results: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        Average the parameters of all analysis results, weighted by their number of samples (or unweighted, if
+        weight_key is None).
+        :return: dictionary of averaged parameters
+        """
+        if not analysis_results:
+            raise ValueError("Federated averaging requires at least one analysis result.")
+        weights = self._weights(analysis_results)
+        if self.parameter_keys is not None:
+            parameter_keys = self.parameter_keys
+        else:
+            parameter_keys = [k for k, v in analysis_results[0].items()
+                              if (k != self.weight_key) and self._is_tensor(v)]
+
+        averaged = {}
+        for key in parameter_keys:
+            try:
+                values = [result[key] for result in analysis_results]
+            except KeyError:
+                raise ValueError(f"Parameter '{key}' is missing in at least one analysis result.")
+            averaged[key] = self._average(values, weights, (key,))
+        return averaged
+
+    def _weights(self, analysis_results: list[dict[str, Any]]) -> Any:
+        if self.weight_key is None:
+            return np.full(len(analysis_results), 1 / len(analysis_results))
+        try:
+            sample_counts = np.array([result[self.weight_key] for result in analysis_results], dtype=np.float64)
+        except KeyError:
+            raise ValueError(f"Number of samples ('{self.weight_key}') is missing in at least one analysis result.")
+        total_samples = sample_counts.sum()
+        if (total_samples <= 0) or (sample_counts < 0).any():
+            raise ValueError(f"Numbers of samples must be non-negative with a positive sum (given: "
+                             f"{sample_counts.tolist()}).")
+        return sample_counts / total_samples
+
+    def _average(self, values: list[Any], weights: Any, path: tuple[str, ...]) -> Any:
+        if isinstance(values[0], dict):
+            if any((not isinstance(v, dict)) or (v.keys() != values[0].keys()) for v in values):
+                raise ValueError(f"Named parameters of '{'.'.join(path)}' differ between analysis results.")
+            return {name: self._average([v[name] for v in values], weights, path + (name,))
+                    for name in values[0].keys()}
+
+        arrays = [np.asarray(v) for v in values]
+        shape = arrays[0].shape
+        if any(a.shape != shape for a in arrays):
+            raise ValueError(f"Shapes of parameter '{'.'.join(path)}' differ between analysis results "
+                             f"({[a.shape for a in arrays]}).")
+        dtype = np.result_type(*arrays)
+        if dtype.kind not in 'fc':
+            dtype = np.dtype(np.float64)
+
+        # stack the parameters of all analyzers into a (reused) buffer, and reduce it with a single weighted sum
+        stack = self._stack_buffers.get(path)
+        if (stack is None) or (stack.shape != (len(arrays),) + shape) or (stack.dtype != dtype):
+            stack = np.empty((len(arrays),) + shape, dtype=dtype)
+            self._stack_buffers[path] = stack
+        for i, a in enumerate(arrays):
+            np.copyto(stack[i, ...], a, casting='unsafe')
+        averaged = np.empty(shape, dtype=dtype)
+        np.dot(weights.astype(dtype), stack.reshape(len(arrays), -1), out=averaged.reshape(-1))
+        return averaged
+
+    @staticmethod
+    def _is_tensor(value: Any) -> bool:
+        if isinstance(value, dict):
+            return bool(value) and all(isinstance(v, np.ndarray) for v in value.values())
+        return isinstance(value, np.ndarray)
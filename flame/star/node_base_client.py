@@ -1,7 +1,10 @@
-from typing import Any, Literal, Optional, Union
+import asyncio
+import inspect
+from typing import Any, Callable, Literal, Optional, Union
 
 from flamesdk import FlameCoreSDK
 from flame.utils.mock_flame_core import MockFlameCoreSDK
+from flame.utils.phase_timer import IterationTimings, PhaseTimer
 
 
 class Node:
@@ -11,6 +14,7 @@ class Node:
     latest_result: Optional[Any]
     partner_node_ids: list[str]
     num_iterations: int
+    timer: PhaseTimer
     flame: Union[FlameCoreSDK, MockFlameCoreSDK]
 
     def __init__(self, flame: Union[FlameCoreSDK, MockFlameCoreSDK]):
@@ -22,6 +26,25 @@ class Node:
         self.latest_result = None
         self.partner_node_ids = self.flame.get_participant_ids()
         self.num_iterations: int = 0
+        self.timer = PhaseTimer(self.id, self.role)
+
+    @property
+    def timings(self) -> list[IterationTimings]:
+        """
+        Timing records of all completed iterations of this node (time per phase and payload sizes).
+        """
+        return self.timer.records
 
     def node_finished(self):
         self.finished = True
+
+
+async def _run_hook(method: Callable[..., Any], *args: Any) -> Any:
+    """
+    Await a hook implemented as coroutine function, or run a synchronous hook in a worker thread (keeping the event
+    loop responsive).
+    :return: return value of the hook
+    """
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    return await asyncio.to_thread(method, *args)
@@ -0,0 +1 @@
+from flame.star.star_async.star_async_model import AsyncStarModel
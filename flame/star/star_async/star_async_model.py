@@ -0,0 +1,178 @@
+import asyncio
+from typing import Any, Optional, Type, Literal, Union
+
+from flamesdk import FlameCoreSDK
+from flame.star.aggregator_client import Aggregator
+from flame.star.analyzer_client import Analyzer
+from flame.star.star_model import StarModel, _ERROR_MESSAGES
+from flame.utils.data_summary import summarize_data
+from flame.utils.lazy_data import LazyNodeData
+from flame.utils.mock_flame_core import MockFlameCoreSDK
+
+
+class AsyncStarModel(StarModel):
+    """
+    Variant of the StarModel running each node on an asyncio event loop.
+
+    Blocking SDK calls are run in worker threads, such that the aggregator sends the aggregated result to all
+    analyzers concurrently, and analyzers fetch their data while awaiting contact with the aggregator. The hooks
+    prepare, analysis_method and aggregation_method may be implemented as coroutine functions (async def), synchronous
+    hooks are run in worker threads.
+    """
+    flame: Union[FlameCoreSDK, MockFlameCoreSDK]
+
+    data: Optional[Union[list[dict[str, Any]], LazyNodeData]] = None
+    test_mode: bool = False
+
+    def _start_aggregator(self,
+                          aggregator: Type[Aggregator],
+                          simple_analysis: bool = True,
+                          output_type: Union[Literal['str', 'bytes', 'pickle'], list] = 'str',
+                          multiple_results: bool = False,
+                          aggregator_kwargs: Optional[dict] = None) -> None:
+        asyncio.run(self._run_aggregator(aggregator,
+                                         simple_analysis=simple_analysis,
+                                         output_type=output_type,
+                                         multiple_results=multiple_results,
+                                         aggregator_kwargs=aggregator_kwargs))
+
+    def _start_analyzer(self,
+                        analyzer: Type[Analyzer],
+                        data_type: Literal['fhir', 's3'],
+                        query: Optional[Union[str, list[str]]] = None,
+                        simple_analysis: bool = True,
+                        analyzer_kwargs: Optional[dict] = None) -> None:
+        asyncio.run(self._run_analyzer(analyzer,
+                                       data_type=data_type,
+                                       query=query,
+                                       simple_analysis=simple_analysis,
+                                       analyzer_kwargs=analyzer_kwargs))
+
+    async def _run_aggregator(self,
+                              aggregator: Type[Aggregator],
+                              simple_analysis: bool = True,
+                              output_type: Union[Literal['str', 'bytes', 'pickle'], list] = 'str',
+                              multiple_results: bool = False,
+                              aggregator_kwargs: Optional[dict] = None) -> None:
+        if issubclass(aggregator, Aggregator):
+            # init custom aggregator subclass
+            if aggregator_kwargs is None:
+                aggregator = aggregator(flame=self.flame)
+            else:
+                aggregator = aggregator(flame=self.flame, **aggregator_kwargs)
+            self._timer = aggregator.timer
+
+            # Ready Check
+            await asyncio.to_thread(self._timed, 'ready_check', self._wait_until_partners_ready)
+
+            # Get analyzer ids
+            analyzers = aggregator.partner_node_ids
+
+            while not aggregator.finished:  # (**)
+                # Await and aggregate intermediate results
+                agg_res, converged = await self._aggregate_round_async(aggregator, analyzers, simple_analysis)
+
+                if converged:
+                    if not self.test_mode:
+                        self.flame.flame_log("Submitting final results...", log_type='info', end='')
+                    response = await asyncio.to_thread(self._timed,
+                                                       'submit_final_result',
+                                                       self.flame.submit_final_result,
+                                                       agg_res,
+                                                       output_type,
+                                                       multiple_results)
+                    if not self.test_mode:
+                        self.flame.flame_log(f"success (response={response})", log_type='info')
+                    self._end_iteration()
+                    await asyncio.to_thread(self.flame.analysis_finished)
+                    aggregator.node_finished()      # LOOP BREAK
+                else:
+                    # Send aggregated result to analyzers
+                    await self._broadcast_aggregated_result_async(aggregator, analyzers, agg_res)
+                    self._end_iteration()
+        else:
+            raise BrokenPipeError(_ERROR_MESSAGES.IS_INCORRECT_CLASS.value)
+
+    async def _aggregate_round_async(self,
+                                     aggregator: Aggregator,
+                                     analyzers: list[str],
+                                     simple_analysis: bool = True) -> tuple[Any, bool]:
+        if aggregator.incremental_aggregation or self._is_asynchronous():
+            # accumulate is synchronous and updates in asynchronous mode interleave receiving with sending, run the
+            # round in a worker thread
+            return await asyncio.to_thread(self._aggregate_round, aggregator, analyzers, simple_analysis)
+
+        def receive_results() -> list[tuple[str, Any]]:
+            if self._is_quorum_round():
+                return list(self._stream_intermediate_data(analyzers, aggregator.num_iterations))
+            with self._phase('await_intermediate_data'):
+                result_dict = self.flame.await_intermediate_data(analyzers)
+            return [(sender, self._decode_received(result)) for sender, result in result_dict.items()]
+
+        received = await asyncio.to_thread(receive_results)
+        contributor_ids = [sender for sender, _ in received]
+        agg_res, converged = await aggregator.aggregate_async([result for _, result in received],
+                                                              simple_analysis,
+                                                              contributor_ids=contributor_ids)
+        if self._is_quorum_round():
+            self._log_partial_round(aggregator, analyzers, contributor_ids)
+        return agg_res, converged
+
+    async def _broadcast_aggregated_result_async(self,
+                                                 aggregator: Aggregator,
+                                                 analyzers: list[str],
+                                                 agg_res: Any) -> None:
+        # Send to every analyzer concurrently
+        broadcasts = await asyncio.to_thread(self._broadcast_payloads, aggregator, analyzers, agg_res)
+        for receivers, payload in broadcasts:
+            self._add_payload('sent', self._unpack(payload)[1], len(receivers))
+        with self._phase('send'):
+            await asyncio.gather(*[asyncio.to_thread(self._send_with_retries, [receiver], payload)
+                                   for receivers, payload in broadcasts for receiver in receivers])
+
+    async def _run_analyzer(self,
+                            analyzer: Type[Analyzer],
+                            data_type: Literal['fhir', 's3'],
+                            query: Optional[Union[str, list[str]]] = None,
+                            simple_analysis: bool = True,
+                            analyzer_kwargs: Optional[dict] = None) -> None:
+        if issubclass(analyzer, Analyzer):
+            # init custom analyzer subclass
+            if analyzer_kwargs is None:
+                analyzer = analyzer(flame=self.flame)
+            else:
+                analyzer = analyzer(flame=self.flame, **analyzer_kwargs)
+            self._timer = analyzer.timer
+
+            aggregator_id = self.flame.get_aggregator_id()
+
+            # Ready Check, while getting data (timed as one phase, as both overlap)
+            with self._phase('ready_check_and_data_loading'):
+                await asyncio.gather(asyncio.to_thread(self._wait_until_partners_ready),
+                                     asyncio.to_thread(self._get_data, query=query, data_type=data_type))
+            self.flame.flame_log(f"\tData extracted: {summarize_data(self.data)}", log_type='info')
+
+            # Round of the latest aggregated result (only tracked in quorum rounds)
+            current_round = 0
+
+            # Check converged status on Hub
+            while not analyzer.finished:  # (**)
+                # Analyze data
+                analyzer_res = await analyzer.analyze_async(data=self.data)
+                # Send intermediate result to aggregator
+                payload = await asyncio.to_thread(self._pack, analyzer_res, current_round)
+                self._add_payload('sent', self._unpack(payload)[1])
+                await asyncio.to_thread(self._timed, 'send', self._send_with_retries, [aggregator_id], payload)
+
+                # If not converged await aggregated result, loop back to (**)
+                if not simple_analysis:
+                    agg_round, agg_res = await asyncio.to_thread(self._receive_aggregated_result, aggregator_id)
+                    current_round = agg_round if agg_round is not None else current_round
+                    analyzer.latest_result = agg_res
+                    if self.flame.config.finished:
+                        analyzer.node_finished()
+                else:
+                    analyzer.node_finished()
+                self._end_iteration()
+        else:
+            raise BrokenPipeError(_ERROR_MESSAGES.IS_INCORRECT_CLASS.value)
@@ -0,0 +1,181 @@
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any, Literal, Optional
+
+from flame.star.analyzer_client import Analyzer
+from flame.star.aggregator_client import Aggregator
+from flame.star.star_model_sweep import SweepResults
+from flame.star.star_model_tester import StarModelTester
+
+
+_SIZE_UNITS = {'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+
+
+class BenchmarkAnalyzer(Analyzer):
+    """
+    Synthetic analyzer sending a payload of fixed size in every round, without any computation. The payload is either
+    a bytes object or a list of floats (of about payload_size bytes when pickled), which is passed through unencoded
+    to the SDK, like e.g. model parameters given as plain lists.
+    """
+    def __init__(self, flame, payload_size: int = 1024, payload_type: Literal['bytes', 'list'] = 'bytes') -> None:
+        super().__init__(flame)
+        self.payload_size = payload_size
+        self.payload_type = payload_type
+
+    def prepare(self, data: list[Any]) -> Any:
+        # allocated once, the same payload is sent in every round
+        if self.payload_type == 'list':
+            return [float(i) for i in range(self.payload_size // 9)]  # pickled floats take 9 bytes each
+        return bytes(self.payload_size)
+
+    def analysis_method(self, data: Any, aggregator_results: Optional[Any]) -> Any:
+        return data
+
+
+class BenchmarkAggregator(Aggregator):
+    """
+    Synthetic aggregator broadcasting the payload of the first analyzer, and recording the start time of every round.
+    Its final result are the recorded times (in seconds, from time.perf_counter) of all rounds, which ends the
+    benchmark after the given number of rounds.
+    """
+    def __init__(self, flame, iterations: int = 5) -> None:
+        super().__init__(flame)
+        self.iterations = iterations
+        self.round_times: list[float] = []
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        self.round_times.append(time.perf_counter())
+        if len(self.round_times) >= self.iterations:
+            return {'round_times': self.round_times}
+        return analysis_results[0]
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        return len(self.round_times) >= self.iterations  # converged with the round returning the recorded times
+
+
+def run_benchmark(num_nodes: int,
+                  payload_size: int,
+                  iterations: int = 5,
+                  backend: Literal['thread', 'process'] = 'thread',
+                  message_transport: Literal['reference', 'shared_memory'] = 'reference',
+                  payload_type: Literal['bytes', 'list'] = 'bytes',
+                  measure_memory: bool = True) -> dict[str, Any]:
+    """
+    Simulate a star pattern of num_nodes synthetic analyzers exchanging payloads of payload_size bytes with the
+    aggregator (in both directions) for the given number of iterations. Payloads are bytes objects, or lists of floats
+    (payload_type='list') to measure the overhead of payloads, which are not encoded to a single buffer.
+
+    Round latencies are measured between the aggregations of consecutive rounds (i.e. including the broadcast, the
+    analyses and the sending of their results), the first round (including setup of the nodes) is reported as startup.
+    Throughput is the payload volume sent per round (to and from every analyzer) divided by the mean round latency.
+    The peak memory is traced with tracemalloc (only within this process, i.e. excluding worker processes of the
+    process backend), which slows down the simulation and may be disabled.
+    :return: dictionary of measurements
+    """
+    if payload_type not in ('bytes', 'list'):
+        raise ValueError(f"Unknown payload type '{payload_type}' (expected 'bytes' or 'list').")
+    if (num_nodes < 1) or (payload_size < 0) or (iterations < 2):
+        raise ValueError(f"Benchmark requires at least one node, a non-negative payload size and two iterations "
+                         f"(given: num_nodes={num_nodes}, payload_size={payload_size}, iterations={iterations}).")
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        tester = StarModelTester(data_splits=[[{'benchmark': b''}] for _ in range(num_nodes)],
+                                 analyzer=BenchmarkAnalyzer,
+                                 aggregator=BenchmarkAggregator,
+                                 data_type='s3',
+                                 simple_analysis=False,
+                                 output_type='pickle',
+                                 analyzer_kwargs={'payload_size': payload_size, 'payload_type': payload_type},
+                                 aggregator_kwargs={'iterations': iterations},
+                                 backend=backend,
+                                 mock_kwargs={'message_transport': message_transport},
+                                 quiet=True)
+        total = time.perf_counter() - start
+        peak_memory = tracemalloc.get_traced_memory()[1] if measure_memory else None
+    finally:
+        if measure_memory:
+            tracemalloc.stop()
+    if tester.errors or (tester.result is None):
+        raise RuntimeError(f"Benchmark simulation failed: {tester.errors}")
+
+    round_times = tester.result['round_times']
+    latencies = [b - a for a, b in zip(round_times, round_times[1:])]
+    mean_latency = sum(latencies) / len(latencies)
+    return {'nodes': num_nodes,
+            'payload_bytes': payload_size,
+            'payload_type': payload_type,
+            'iterations': iterations,
+            'startup_s': round_times[0] - start,
+            'round_ms_mean': 1000 * mean_latency,
+            'round_ms_max': 1000 * max(latencies),
+            'throughput_mb_s': 2 * num_nodes * payload_size / mean_latency / 1024 ** 2 if mean_latency > 0 else None,
+            'total_s': total,
+            'peak_memory_mb': peak_memory / 1024 ** 2 if peak_memory is not None else None}
+
+
+def run_benchmarks(node_counts: list[int],
+                   payload_sizes: list[int],
+                   iterations: list[int],
+                   **benchmark_kwargs: Any) -> SweepResults:
+    """
+    Run benchmarks for all combinations of node counts, payload sizes and iterations (see run_benchmark).
+    :return: one row of measurements per benchmark
+    """
+    rows = [run_benchmark(num_nodes, payload_size, num_iterations, **benchmark_kwargs)
+            for num_nodes in node_counts for payload_size in payload_sizes for num_iterations in iterations]
+    columns = ['nodes', 'payload_bytes', 'payload_type', 'iterations', 'startup_s', 'round_ms_mean', 'round_ms_max',
+               'throughput_mb_s', 'total_s', 'peak_memory_mb']
+    return SweepResults(rows, columns)
+
+
+def parse_size(size: str) -> int:
+    """
+    Parse a size given in bytes, or with unit B, KB, MB or GB (e.g. '100MB').
+    :return: size in bytes
+    """
+    text = size.strip().upper()
+    for unit in sorted(_SIZE_UNITS.keys(), key=len, reverse=True):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * _SIZE_UNITS[unit])
+    return int(text)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the per-round overhead of the star pattern with synthetic "
+                                                 "analyzers and aggregator.")
+    parser.add_argument('--nodes', type=int, nargs='+', default=[2, 8, 32],
+                        help="numbers of analyzer nodes (default: 2 8 32)")
+    parser.add_argument('--payload-sizes', type=parse_size, nargs='+', default=[1024, 1024 ** 2],
+                        help="payload sizes sent by every node, e.g. 1KB 100MB (default: 1KB 1MB)")
+    parser.add_argument('--iterations', type=int, nargs='+', default=[5],
+                        help="numbers of iterations (default: 5)")
+    parser.add_argument('--backend', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--transport', choices=['reference', 'shared_memory'], default='reference',
+                        help="message transport of the mock broker (default: reference)")
+    parser.add_argument('--payload-type', choices=['bytes', 'list'], default='bytes',
+                        help="payloads as bytes objects or lists of floats (default: bytes)")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="do not trace the peak memory (tracing slows down the simulation)")
+    parser.add_argument('--json', action='store_true', help="print results as JSON lines instead of a table")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.nodes,
+                             args.payload_sizes,
+                             args.iterations,
+                             backend=args.backend,
+                             message_transport=args.transport,
+                             payload_type=args.payload_type,
+                             measure_memory=not args.no_memory)
+    if args.json:
+        for row in results:
+            print(json.dumps(row))
+    else:
+        print(results.format_table())
+
+
+if __name__ == "__main__":
+    main()
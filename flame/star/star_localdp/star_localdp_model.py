@@ -3,14 +3,17 @@ from typing import Optional, Type, Literal, Union, Any
 from flamesdk import FlameCoreSDK
 from flame.star.aggregator_client import Aggregator
 from flame.star.analyzer_client import Analyzer
-from flame.star.star_model import StarModel, _ERROR_MESSAGES
+from flame.star.star_model import StarModel, _ERROR_MESSAGES, _STREAM_POLL_INTERVAL
+from flame.utils.codec import Codec
+from flame.utils.data_summary import bounded_repr
+from flame.utils.lazy_data import LazyNodeData
 from flame.utils.mock_flame_core import MockFlameCoreSDK
 
 
 class StarLocalDPModel(StarModel):
     flame: Union[FlameCoreSDK, MockFlameCoreSDK]
 
-    data: Optional[list[dict[str, Any]]] = None
+    data: Optional[Union[list[dict[str, Any]], LazyNodeData]] = None
     test_mode: bool = False
 
     epsilon: Optional[float]
@@ -28,6 +31,20 @@ class StarLocalDPModel(StarModel):
                  aggregator_kwargs: Optional[dict] = None,
                  epsilon: Optional[float] = None,
                  sensitivity: Optional[float] = None,
+                 lazy_data: bool = False,
+                 lazy_data_cache: bool = True,
+                 mmap_s3_data: bool = False,
+                 quorum: Optional[int] = None,
+                 round_timeout: Optional[float] = None,
+                 late_results: Literal['drop', 'next_round'] = 'drop',
+                 max_staleness: Optional[int] = None,
+                 poll_interval: float = _STREAM_POLL_INTERVAL,
+                 codec: Optional[Codec] = None,
+                 delta_broadcast: bool = False,
+                 broadcast_workers: int = 1,
+                 send_attempts: int = 1,
+                 log_timings: bool = False,
+                 linger_timeout: Optional[float] = None,
                  test_mode: bool = False,
                  test_kwargs: Optional[dict] = None) -> None:
         self.epsilon = epsilon
@@ -41,6 +58,20 @@ class StarLocalDPModel(StarModel):
                          multiple_results=multiple_results,
                          analyzer_kwargs=analyzer_kwargs,
                          aggregator_kwargs=aggregator_kwargs,
+                         lazy_data=lazy_data,
+                         lazy_data_cache=lazy_data_cache,
+                         mmap_s3_data=mmap_s3_data,
+                         quorum=quorum,
+                         round_timeout=round_timeout,
+                         late_results=late_results,
+                         max_staleness=max_staleness,
+                         poll_interval=poll_interval,
+                         codec=codec,
+                         delta_broadcast=delta_broadcast,
+                         broadcast_workers=broadcast_workers,
+                         send_attempts=send_attempts,
+                         log_timings=log_timings,
+                         linger_timeout=linger_timeout,
                          test_mode=test_mode,
                          test_kwargs=test_kwargs)
 
@@ -56,20 +87,19 @@ class StarLocalDPModel(StarModel):
                 aggregator = aggregator(flame=self.flame)
             else:
                 aggregator = aggregator(flame=self.flame, **aggregator_kwargs)
+            self._timer = aggregator.timer
 
             # Ready Check
-            self._wait_until_partners_ready()
+            with self._phase('ready_check'):
+                self._wait_until_partners_ready()
 
             # Get analyzer ids
             analyzers = aggregator.partner_node_ids
 
             while not aggregator.finished:  # (**)
-                # Await intermediate results
-                result_dict = self.flame.await_intermediate_data(analyzers)
-
-                # Aggregate results
-                agg_res, converged = aggregator.aggregate(list(result_dict.values()), simple_analysis)
-                self.flame.flame_log(f"Aggregated results: {str(agg_res)[:100]}")
+                # Await and aggregate intermediate results
+                agg_res, converged = self._aggregate_round(aggregator, analyzers, simple_analysis)
+                self.flame.flame_log(f"Aggregated results: {bounded_repr(agg_res)}")
 
                 if converged:
                     if not self.test_mode:
@@ -84,13 +114,19 @@ class StarLocalDPModel(StarModel):
                         self.flame.flame_log(f"\tTest mode: Would apply local DP with epsilon={local_dp['epsilon']} "
                                              f"and sensitivity={local_dp['sensitivity']}",
                                              log_type='info')
-                    response = self.flame.submit_final_result(agg_res, output_type, multiple_results, local_dp=local_dp)
+                    with self._phase('submit_final_result'):
+                        response = self.flame.submit_final_result(agg_res,
+                                                                  output_type,
+                                                                  multiple_results,
+                                                                  local_dp=local_dp)
                     if not self.test_mode:
                         self.flame.flame_log(f"success (response={response})", log_type='info')
+                    self._end_iteration()
                     self.flame.analysis_finished()
                     aggregator.node_finished()  # LOOP BREAK
                 else:
                     # Send aggregated result to analyzers
-                    self.flame.send_intermediate_data(analyzers, agg_res)
+                    self._broadcast_aggregated_result(aggregator, analyzers, agg_res)
+                    self._end_iteration()
         else:
             raise BrokenPipeError(_ERROR_MESSAGES.IS_INCORRECT_CLASS.value)
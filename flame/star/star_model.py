@@ -1,10 +1,22 @@
+import copy
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from enum import Enum
-from typing import Optional, Type, Literal, Union, Any
+from typing import Callable, ContextManager, Iterator, Optional, Type, Literal, Union, Any
 
 from flamesdk import FlameCoreSDK
 from flame.star.aggregator_client import Aggregator
 from flame.star.analyzer_client import Analyzer
+from flame.utils.codec import Codec, PayloadCache, PickleCodec
+from flame.utils.data_summary import summarize_data
+from flame.utils.delta import apply_delta, compute_delta
+from flame.utils.lazy_data import LazyNodeData
+from flame.utils.mapped_data import spill_s3_data
 from flame.utils.mock_flame_core import MockFlameCoreSDK
+from flame.utils.phase_timer import PhaseTimer, payload_size
 
 
 class _ERROR_MESSAGES(Enum):
@@ -14,12 +26,33 @@ class _ERROR_MESSAGES(Enum):
                          'intended template class.'
 
 
+# Default seconds between checks for newly arrived results in incremental aggregation and quorum rounds. Timed awaits
+# return once all awaited results arrived or the interval expired, i.e. a round closes up to one interval after its
+# quorum is reached. Shorter intervals close rounds sooner, at the cost of more frequent awaits (requests to the
+# message broker) while results are outstanding.
+_STREAM_POLL_INTERVAL = 0.1
+
+
 class StarModel:
     flame: Union[FlameCoreSDK, MockFlameCoreSDK]
 
-    data: Optional[list[dict[str, Any]]] = None
+    data: Optional[Union[list[dict[str, Any]], LazyNodeData]] = None
     test_mode: bool = False
 
+    lazy_data: bool = False
+    lazy_data_cache: bool = True
+    mmap_s3_data: bool = False
+    quorum: Optional[int] = None
+    round_timeout: Optional[float] = None
+    late_results: Literal['drop', 'next_round'] = 'drop'
+    max_staleness: Optional[int] = None
+    poll_interval: float = _STREAM_POLL_INTERVAL
+    codec: Codec
+    delta_broadcast: bool = False
+    broadcast_workers: int = 1
+    send_attempts: int = 1
+    log_timings: bool = False
+
     def __init__(self,
                  analyzer: Type[Analyzer],
                  aggregator: Type[Aggregator],
@@ -30,8 +63,54 @@ class StarModel:
                  multiple_results: bool = False,
                  analyzer_kwargs: Optional[dict] = None,
                  aggregator_kwargs: Optional[dict] = None,
+                 lazy_data: bool = False,
+                 lazy_data_cache: bool = True,
+                 mmap_s3_data: bool = False,
+                 quorum: Optional[int] = None,
+                 round_timeout: Optional[float] = None,
+                 late_results: Literal['drop', 'next_round'] = 'drop',
+                 max_staleness: Optional[int] = None,
+                 poll_interval: float = _STREAM_POLL_INTERVAL,
+                 codec: Optional[Codec] = None,
+                 delta_broadcast: bool = False,
+                 broadcast_workers: int = 1,
+                 send_attempts: int = 1,
+                 log_timings: bool = False,
+                 linger_timeout: Optional[float] = None,
                  test_mode: bool = False,
                  test_kwargs: Optional[dict] = None) -> None:
+        self.lazy_data = lazy_data
+        self.lazy_data_cache = lazy_data_cache
+        self.mmap_s3_data = mmap_s3_data
+        self.quorum = quorum
+        self.round_timeout = round_timeout
+        self.late_results = late_results
+        if (max_staleness is not None) and ((max_staleness < 0) or (quorum is not None) or (round_timeout is not None)):
+            raise ValueError(f"max_staleness must be non-negative and cannot be combined with quorum or round_timeout "
+                             f"(given: max_staleness={max_staleness}, quorum={quorum}, round_timeout={round_timeout}).")
+        self.max_staleness = max_staleness
+        if poll_interval <= 0:
+            raise ValueError(f"poll_interval must be positive (given: {poll_interval}).")
+        self.poll_interval = poll_interval
+        self.codec = codec if codec is not None else Codec()
+        # Aggregated results are encoded to a single buffer before being sent to several receivers, the pass-through
+        # codec would leave it to the SDK to serialize them again for every receiver and attempt
+        self._broadcast_codec = self.codec if type(self.codec) is not Codec else PickleCodec()
+        self.delta_broadcast = delta_broadcast
+        if (broadcast_workers < 1) or (send_attempts < 1):
+            raise ValueError(f"broadcast_workers and send_attempts must be at least 1 (given: "
+                             f"broadcast_workers={broadcast_workers}, send_attempts={send_attempts}).")
+        self.broadcast_workers = broadcast_workers
+        self.send_attempts = send_attempts
+        self.log_timings = log_timings
+
+        self._result_rounds: dict[str, int] = {}  # round of the latest result per analyzer (quorum rounds)
+        self._delta_base: Optional[Any] = None  # latest aggregated result sent/received (delta broadcasts)
+        self._delta_version: Optional[int] = None
+        self._pending_replies: list[str] = []  # analyzers awaiting the next update (asynchronous mode)
+        self._payload_cache = PayloadCache()  # encoded broadcasts of the current round
+        self._timer: Optional[PhaseTimer] = None  # phase timings of the node (see Node.timings)
+
         self.test_mode = test_mode
         if self.test_mode:
             self.test_kwargs = test_kwargs
@@ -59,8 +138,19 @@ class StarModel:
             raise BrokenPipeError("Has to be either analyzer or aggregator")
         if not self.test_mode:
             self.flame.flame_log("Analysis finished!", log_type='info')
-            while True:
-                pass  # keep the node alive to allow for orderly shutdown
+            self._linger(linger_timeout)  # keep the node alive to allow for orderly shutdown
+
+    @staticmethod
+    def _linger(linger_timeout: Optional[float] = None) -> None:
+        """
+        Block without consuming CPU until the node receives SIGTERM/SIGINT or the linger timeout (in seconds) expires.
+        Without a linger timeout, the node is kept alive until it is shut down by the orchestrator.
+        """
+        shutdown_event = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(sig, lambda signum, frame: shutdown_event.set())
+        shutdown_event.wait(timeout=linger_timeout)
 
     def _is_aggregator(self) -> bool:
         return self.flame.get_role() == 'aggregator'
@@ -80,34 +170,315 @@ class StarModel:
                 aggregator = aggregator(flame=self.flame)
             else:
                 aggregator = aggregator(flame=self.flame, **aggregator_kwargs)
+            self._timer = aggregator.timer
 
             # Ready Check
-            self._wait_until_partners_ready()
+            with self._phase('ready_check'):
+                self._wait_until_partners_ready()
 
             # Get analyzer ids
             analyzers = aggregator.partner_node_ids
 
             while not aggregator.finished:  # (**)
-                # Await intermediate results
-                result_dict = self.flame.await_intermediate_data(analyzers)
-
-                # Aggregate results
-                agg_res, converged = aggregator.aggregate(list(result_dict.values()), simple_analysis)
+                # Await and aggregate intermediate results
+                agg_res, converged = self._aggregate_round(aggregator, analyzers, simple_analysis)
 
                 if converged:
                     if not self.test_mode:
                         self.flame.flame_log("Submitting final results...", log_type='info', end='')
-                    response = self.flame.submit_final_result(agg_res, output_type, multiple_results)
+                    with self._phase('submit_final_result'):
+                        response = self.flame.submit_final_result(agg_res, output_type, multiple_results)
                     if not self.test_mode:
                         self.flame.flame_log(f"success (response={response})", log_type='info')
+                    self._end_iteration()
                     self.flame.analysis_finished()
                     aggregator.node_finished()      # LOOP BREAK
                 else:
                     # Send aggregated result to analyzers
-                    self.flame.send_intermediate_data(analyzers, agg_res)
+                    self._broadcast_aggregated_result(aggregator, analyzers, agg_res)
+                    self._end_iteration()
         else:
             raise BrokenPipeError(_ERROR_MESSAGES.IS_INCORRECT_CLASS.value)
 
+    def _phase(self, name: str) -> ContextManager:
+        """
+        Time a phase of the current iteration of the node (once the node has been initialized).
+        """
+        return self._timer.phase(name) if self._timer is not None else nullcontext()
+
+    def _timed(self, name: str, method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        with self._phase(name):
+            return method(*args, **kwargs)
+
+    def _end_iteration(self) -> None:
+        record = self._timer.end_iteration()
+        if self.log_timings:
+            self.flame.flame_log(f"\t{record}", log_type='info')
+
+    def _is_quorum_round(self) -> bool:
+        return (self.quorum is not None) or (self.round_timeout is not None) or self._is_asynchronous()
+
+    def _is_asynchronous(self) -> bool:
+        return self.max_staleness is not None
+
+    def _aggregate_round(self,
+                         aggregator: Aggregator,
+                         analyzers: list[str],
+                         simple_analysis: bool = True) -> tuple[Any, bool]:
+        if aggregator.incremental_aggregation or self._is_quorum_round():
+            # Fold results into the aggregate as they arrive
+            contributor_ids = []
+
+            def node_results() -> Iterator[Any]:
+                for sender, result in self._stream_intermediate_data(analyzers, aggregator.num_iterations):
+                    contributor_ids.append(sender)
+                    yield result
+                    del result  # not to hold the result while awaiting the next one
+
+            results = node_results()
+            if self._is_asynchronous():
+                # Update with the results arrived so far, once at least one of them is recent enough
+                results = list(results)
+                while not results:
+                    # only stale results arrived, send their analyzers the latest aggregated result to resume with
+                    self._broadcast_aggregated_result(aggregator, analyzers, aggregator.latest_result)
+                    results = list(node_results())
+
+            if aggregator.incremental_aggregation:
+                agg_res, converged = aggregator.aggregate_incrementally(results,
+                                                                        simple_analysis,
+                                                                        contributor_ids=contributor_ids)
+            else:
+                agg_res, converged = aggregator.aggregate(list(results),
+                                                          simple_analysis,
+                                                          contributor_ids=contributor_ids)
+            self._log_partial_round(aggregator, analyzers, contributor_ids)
+            return agg_res, converged
+        else:
+            with self._phase('await_intermediate_data'):
+                result_dict = self.flame.await_intermediate_data(analyzers)
+            return aggregator.aggregate([self._decode_received(result) for result in result_dict.values()],
+                                        simple_analysis,
+                                        contributor_ids=list(result_dict.keys()))
+
+    def _log_partial_round(self, aggregator: Aggregator, analyzers: list[str], contributor_ids: list[str]) -> None:
+        if len(contributor_ids) < len(analyzers):
+            self.flame.flame_log(f"\tRound {aggregator.num_iterations - 1} closed with results from "
+                                 f"{len(contributor_ids)}/{len(analyzers)} analyzers", log_type='info')
+
+    def _stream_intermediate_data(self, senders: list[str], current_round: int) -> Iterator[tuple[str, Any]]:
+        """
+        Yield (sender, result) pairs as soon as results arrive, until every sender has reported once. Results of None
+        are considered as not yet received.
+
+        In quorum rounds, results are tagged with their round: the stream is closed once the quorum of senders has
+        reported or the round timeout has expired (after at least one sender has reported), and results of earlier
+        rounds are either dropped or counted towards the current round (late_results='next_round').
+
+        In asynchronous mode (max_staleness), the stream is closed as soon as results have arrived, and results based
+        on an aggregated result more than max_staleness rounds old are dropped. The analyzers of all closed results
+        (received or dropped) are awaiting the next aggregated result.
+
+        Arrived results are collected every poll_interval seconds (or as soon as all remaining senders have reported),
+        i.e. results are handed over up to poll_interval seconds after their arrival.
+        """
+        if self._is_asynchronous():
+            quorum, deadline = 1, None
+        elif self._is_quorum_round():
+            quorum = len(senders) if self.quorum is None else min(self.quorum, len(senders))
+            deadline = None if self.round_timeout is None else time.monotonic() + self.round_timeout
+        else:
+            quorum, deadline = len(senders), None
+
+        remaining_senders = list(senders)
+        num_received = 0
+        while remaining_senders and (num_received < quorum):
+            poll_interval = self.poll_interval
+            if deadline is not None:
+                time_left = deadline - time.monotonic()
+                if time_left <= 0:
+                    if num_received > 0:
+                        break
+                else:
+                    poll_interval = min(poll_interval, time_left)
+            with self._phase('await_intermediate_data'):
+                result_dict = self.flame.await_intermediate_data(remaining_senders, timeout=poll_interval)
+            while result_dict:
+                # hand over results one by one, the stream holds no reference to results already consumed
+                sender = next(iter(result_dict))
+                result = result_dict.pop(sender)
+                if (sender not in remaining_senders) or (result is None):
+                    continue
+                result_round, result = self._unpack(result)
+                if self._is_asynchronous():
+                    self._pending_replies.append(sender)
+                    if current_round - result_round > self.max_staleness:
+                        self.flame.flame_log(f"\tDropped stale result of round {result_round} from {sender} "
+                                             f"(staleness {current_round - result_round})", log_type='info')
+                        remaining_senders.remove(sender)
+                        continue
+                elif (result_round is not None) and (result_round < current_round) and (self.late_results == 'drop'):
+                    self.flame.flame_log(f"\tDropped late result of round {result_round} from {sender}",
+                                         log_type='info')
+                    continue
+                remaining_senders.remove(sender)
+                num_received += 1
+                if result_round is not None:
+                    self._result_rounds[sender] = result_round
+                yield sender, self._decode_received(result)
+            result = None
+
+    def _decode_received(self, payload: Any, codec: Optional[Codec] = None) -> Any:
+        self._add_payload('received', payload)
+        with self._phase('deserialization'):
+            return (self.codec if codec is None else codec).decode(payload)
+
+    def _add_payload(self, direction: str, payload: Any, num_receivers: int = 1) -> None:
+        """
+        Record the size of an encoded payload sent to num_receivers (direction='sent') or received
+        (direction='received') in the phase timings. Sizes of payloads other than buffers are only estimated if timings
+        are logged.
+        """
+        if self._timer is not None:
+            size = payload_size(payload, deep=self.log_timings)
+            if size is not None:
+                self._timer.add_payload(direction, size * num_receivers)
+
+    def _broadcast_aggregated_result(self, aggregator: Aggregator, analyzers: list[str], agg_res: Any) -> None:
+        for receivers, payload in self._broadcast_payloads(aggregator, analyzers, agg_res):
+            self._send(receivers, payload)
+
+    def _send(self, receivers: list[str], payload: Any) -> dict[str, int]:
+        """
+        Send the same payload to all receivers. With broadcast_workers > 1, it is sent to every receiver separately
+        and concurrently in a thread pool, otherwise in one bulk send. Receivers, for which sending failed, are retried
+        until send_attempts is exhausted. The payload is shared by all sends, i.e. it should be encoded to a buffer
+        beforehand (see _broadcast_payloads) for it not to be serialized again with every send.
+        :return: number of attempts per receiver
+        """
+        self._add_payload('sent', self._unpack(payload)[1], len(receivers))
+        with self._phase('send'):
+            if (self.broadcast_workers > 1) and (len(receivers) > 1):
+                with ThreadPoolExecutor(max_workers=min(self.broadcast_workers, len(receivers))) as executor:
+                    attempts = {}
+                    for receiver_attempts in executor.map(
+                            lambda receiver: self._send_with_retries([receiver], payload), receivers):
+                        attempts.update(receiver_attempts)
+            else:
+                attempts = self._send_with_retries(receivers, payload)
+
+        num_resent = sum(1 for num_attempts in attempts.values() if num_attempts > 1)
+        if num_resent:
+            self.flame.flame_log(f"\tResent intermediate data to {num_resent}/{len(receivers)} receivers",
+                                 log_type='info')
+        return attempts
+
+    def _send_with_retries(self, receivers: list[str], payload: Any) -> dict[str, int]:
+        """
+        Send the payload to the receivers, and resend it to those for which sending failed (up to send_attempts).
+        :return: number of attempts per receiver
+        """
+        attempts = {receiver: 0 for receiver in receivers}
+        pending = list(receivers)
+        for _ in range(self.send_attempts):
+            for receiver in pending:
+                attempts[receiver] += 1
+            _, pending = self.flame.send_intermediate_data(pending, payload)
+            if not pending:
+                return attempts
+        raise BrokenPipeError(f"Failed to send intermediate data to {pending} after {self.send_attempts} attempts.")
+
+    def _broadcast_payloads(self,
+                            aggregator: Aggregator,
+                            analyzers: list[str],
+                            agg_res: Any) -> list[tuple[list[str], Any]]:
+        """
+        Prepare the broadcast of an aggregated result (full result, or changes for delta broadcasts). Every payload is
+        encoded once with the broadcast codec, and the same buffer is sent to all of its receivers.
+        :return: list of (receivers, payload) to be sent
+        """
+        version = aggregator.num_iterations
+        if self._is_asynchronous():
+            # Only reply to analyzers awaiting an update, the others resume with it after sending their next result
+            analyzers = [a for a in analyzers if a in self._pending_replies]
+            self._pending_replies = []
+        if not self.delta_broadcast:
+            return [(analyzers, self._pack_cached(agg_res, version))]
+
+        # Send only the changes since the previous broadcast to analyzers known to hold it, the full result otherwise
+        if self._delta_base is None:
+            delta_receivers = []
+        elif self._is_quorum_round():
+            delta_receivers = [a for a in analyzers if self._result_rounds.get(a) == self._delta_version]
+        else:
+            delta_receivers = list(analyzers)
+        full_receivers = [a for a in analyzers if a not in delta_receivers]
+
+        broadcasts = []
+        if delta_receivers:
+            delta = compute_delta(self._delta_base, agg_res)
+            broadcasts.append((delta_receivers, self._pack({'version': version,
+                                                            'base': self._delta_version,
+                                                            'delta': delta}, version, self._broadcast_codec)))
+        if full_receivers:
+            broadcasts.append((full_receivers, self._pack({'version': version,
+                                                           'base': None,
+                                                           'delta': compute_delta(None, agg_res)},
+                                                          version,
+                                                          self._broadcast_codec)))
+        self._delta_base, self._delta_version = copy.deepcopy(agg_res), version
+        return broadcasts
+
+    def _receive_aggregated_result(self, aggregator_id: str) -> tuple[Optional[int], Any]:
+        """
+        Await the aggregated result, and reconstruct it from the previously received one for delta broadcasts.
+        :return: round (None outside of quorum rounds) and aggregated result (None, if the analysis was finished)
+        """
+        with self._phase('await_aggregated_result'):
+            payload = self.flame.await_intermediate_data([aggregator_id])[aggregator_id]
+        if payload is None:
+            return None, None
+        agg_round, agg_res = self._unpack(payload)
+        agg_res = self._decode_received(agg_res, self._broadcast_codec)
+        if self.delta_broadcast:
+            if (agg_res['base'] is not None) and (agg_res['base'] != self._delta_version):
+                raise RuntimeError(f"Received changes relative to aggregated result {agg_res['base']}, but latest "
+                                   f"received aggregated result is {self._delta_version}.")
+            with self._phase('deserialization'):
+                version, agg_res = agg_res['version'], apply_delta(self._delta_base, agg_res['delta'])
+                self._delta_base, self._delta_version = copy.deepcopy(agg_res), version
+        return agg_round, agg_res
+
+    def _pack(self, data: Any, current_round: int, codec: Optional[Codec] = None) -> Any:
+        """
+        Encode data with the codec (the model's codec by default), and tag it with the current round in quorum rounds.
+        :return: payload to be sent
+        """
+        with self._phase('serialization'):
+            payload = (self.codec if codec is None else codec).encode(data)
+        if self._is_quorum_round():
+            payload = {'round': current_round, 'data': payload}
+        return payload
+
+    def _pack_cached(self, data: Any, current_round: int) -> Any:
+        """
+        Pack data with the broadcast codec only once per round, and reuse the payload whenever the same object is
+        broadcast again in this round.
+        :return: payload to be sent
+        """
+        return self._payload_cache.get(data,
+                                       current_round,
+                                       lambda obj: self._pack(obj, current_round, self._broadcast_codec))
+
+    def _unpack(self, payload: Any) -> tuple[Optional[int], Any]:
+        """
+        Strip the round tag from a received payload (in quorum rounds).
+        :return: round (None outside of quorum rounds) and still encoded data
+        """
+        if self._is_quorum_round():
+            return payload['round'], payload['data']
+        return None, payload
+
     def _start_analyzer(self,
                         analyzer: Type[Analyzer],
                         data_type: Literal['fhir', 's3'],
@@ -120,33 +491,45 @@ class StarModel:
                 analyzer = analyzer(flame=self.flame)
             else:
                 analyzer = analyzer(flame=self.flame, **analyzer_kwargs)
+            self._timer = analyzer.timer
 
             aggregator_id = self.flame.get_aggregator_id()
 
             # Ready Check
-            self._wait_until_partners_ready()
+            with self._phase('ready_check'):
+                self._wait_until_partners_ready()
 
             # Get data
-            self._get_data(query=query, data_type=data_type)
-            self.flame.flame_log(f"\tData extracted: {str(self.data)[:100]}", log_type='info')
+            with self._phase('data_loading'):
+                self._get_data(query=query, data_type=data_type)
+            self.flame.flame_log(f"\tData extracted: {summarize_data(self.data)}", log_type='info')
+
+            # Round of the latest aggregated result (only tracked in quorum rounds)
+            current_round = 0
 
             # Check converged status on Hub
             while not analyzer.finished:  # (**)
                 # Analyze data
                 analyzer_res = analyzer.analyze(data=self.data)
                 # Send intermediate result to aggregator
-                self.flame.send_intermediate_data([aggregator_id], analyzer_res)
+                self._send_analysis_result(aggregator_id, analyzer_res, current_round)
 
                 # If not converged await aggregated result, loop back to (**)
                 if not simple_analysis:
-                    analyzer.latest_result = self.flame.await_intermediate_data([aggregator_id])[aggregator_id]
+                    agg_round, agg_res = self._receive_aggregated_result(aggregator_id)
+                    current_round = agg_round if agg_round is not None else current_round
+                    analyzer.latest_result = agg_res
                     if self.flame.config.finished:
                         analyzer.node_finished()
                 else:
                     analyzer.node_finished()
+                self._end_iteration()
         else:
             raise BrokenPipeError(_ERROR_MESSAGES.IS_INCORRECT_CLASS.value)
 
+    def _send_analysis_result(self, aggregator_id: str, analyzer_res: Any, current_round: int) -> None:
+        self._send([aggregator_id], self._pack(analyzer_res, current_round))
+
     def _wait_until_partners_ready(self) -> None:
         if self._is_analyzer():
             aggregator_id = self.flame.get_aggregator_id()
@@ -175,7 +558,15 @@ class StarModel:
         if type(query) == str:
             query = [query]
 
-        if data_type == 'fhir':
+        if self.lazy_data:
+            self.data = LazyNodeData(self.flame,
+                                     data_type,
+                                     query,
+                                     cache=self.lazy_data_cache,
+                                     mmap_s3_data=self.mmap_s3_data)
+        elif data_type == 'fhir':
             self.data = self.flame.get_fhir_data(query)
+        elif self.mmap_s3_data:
+            self.data = spill_s3_data(self.flame.get_s3_data(query))
         else:
             self.data = self.flame.get_s3_data(query)
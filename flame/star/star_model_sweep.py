@@ -0,0 +1,182 @@
+import copy
+import itertools
+import re
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, Literal, Optional, Type, Union
+
+from flame.star.analyzer_client import Analyzer as StarAnalyzer
+from flame.star.aggregator_client import Aggregator as StarAggregator
+from flame.star.star_model_tester import StarModelTester
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+_ANSI_ESCAPES = re.compile(r'\033\[[0-9;]*m')
+
+
+class SweepResults:
+    """
+    Tabular results of a parameter sweep with one row per run, containing the run's index, the name of its data
+    splits (if named), its configuration, its final result, its error (None, if the run succeeded) and its duration in
+    seconds.
+    """
+    def __init__(self, rows: list[dict[str, Any]], columns: list[str]) -> None:
+        self.rows = rows
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter(self.rows)
+
+    def __getitem__(self, index: int) -> dict[str, Any]:
+        return self.rows[index]
+
+    def column(self, name: str) -> list[Any]:
+        return [row.get(name) for row in self.rows]
+
+    def to_dataframe(self) -> Any:
+        """
+        Convert the results to a pandas DataFrame (requires pandas to be installed).
+        :return: DataFrame with one row per run
+        """
+        if pd is None:
+            raise ImportError("SweepResults.to_dataframe requires pandas to be installed.")
+        return pd.DataFrame(self.rows, columns=self.columns)
+
+    def format_table(self, max_width: int = 40) -> str:
+        """
+        Render the results as text table, truncating cells to max_width characters.
+        :return: table
+        """
+        def cell(value: Any) -> str:
+            text = f"{value:.3f}" if isinstance(value, float) else str(value)
+            return text if len(text) <= max_width else text[:max_width - 3] + '...'
+
+        cells = [[cell(row.get(column)) for column in self.columns] for row in self.rows]
+        widths = [max([len(column)] + [len(row[i]) for row in cells]) for i, column in enumerate(self.columns)]
+        lines = [' | '.join(column.ljust(width) for column, width in zip(self.columns, widths)),
+                 '-+-'.join('-' * width for width in widths)]
+        lines.extend(' | '.join(text.ljust(width) for text, width in zip(row, widths)) for row in cells)
+        return '\n'.join(lines)
+
+    def __str__(self) -> str:
+        return self.format_table()
+
+
+class StarModelSweep:
+    """
+    Run StarModelTester simulations of the same analyzer and aggregator for a number of configurations (e.g. a grid
+    of analyzer_kwargs, aggregator_kwargs, or epsilon and sensitivity) concurrently on a pool of worker threads.
+
+    Configurations are given as a list of dictionaries of StarModelTester arguments, or as a grid (dictionary of
+    argument lists), which is expanded to all combinations. Data splits may be given as a dictionary of named splits,
+    which configurations refer to by name under the key 'data_splits' (configurations without one are run on every
+    named split). Every run is given its own copies of the containers of its data splits (the list of datasources per
+    node and every datasource), while the datasets themselves are shared read-only between runs, such that nodes may
+    add, replace or remove datasets without interfering with concurrent runs. Nodes modifying datasets in place have to
+    set copy_splits=True, which gives every run a deep copy of its data splits instead, at the cost of holding the data
+    once per concurrent run in memory. Further keyword arguments are passed to every StarModelTester (e.g. backend
+    or model_kwargs).
+
+    Runs are executed quietly (without printing logs of every iteration), their results are available as
+    SweepResults in self.results.
+    """
+    def __init__(self,
+                 data_splits: Union[list[Any], dict[str, list[Any]]],
+                 analyzer: Type[StarAnalyzer],
+                 aggregator: Type[StarAggregator],
+                 data_type: Literal['fhir', 's3'],
+                 configurations: Union[list[dict[str, Any]], dict[str, list[Any]]],
+                 max_workers: Optional[int] = None,
+                 quiet: bool = False,
+                 copy_splits: bool = False,
+                 **tester_kwargs: Any) -> None:
+        self.results: Optional[SweepResults] = None
+
+        named_splits = data_splits if isinstance(data_splits, dict) else None
+        if named_splits is not None:
+            for splits in named_splits.values():
+                StarModelTester.test_input(splits[0])
+        else:
+            StarModelTester.test_input(data_splits[0])
+
+        runs = []
+        for configuration in self.expand_configurations(configurations):
+            if named_splits is None:
+                runs.append((None, configuration))
+            elif 'data_splits' in configuration:
+                if configuration['data_splits'] not in named_splits:
+                    raise ValueError(f"Unknown data splits '{configuration['data_splits']}' (expected one of "
+                                     f"{list(named_splits.keys())}).")
+                runs.append((configuration['data_splits'],
+                             {k: v for k, v in configuration.items() if k != 'data_splits'}))
+            else:
+                runs.extend((name, configuration) for name in named_splits.keys())
+
+        def run(run_index: int) -> dict[str, Any]:
+            splits_name, configuration = runs[run_index]
+            splits = named_splits[splits_name] if named_splits is not None else data_splits
+            row = {'run': run_index}
+            if named_splits is not None:
+                row['data_splits'] = splits_name
+            row.update(configuration)
+            start = time.perf_counter()
+            try:
+                tester = StarModelTester(data_splits=self._copy_splits(splits, deep=copy_splits),
+                                         analyzer=analyzer,
+                                         aggregator=aggregator,
+                                         data_type=data_type,
+                                         **{**tester_kwargs, **configuration},
+                                         quiet=True)
+                row['result'] = tester.result
+                row['error'] = self._error_summary(tester.errors)
+            except Exception:
+                row['result'] = None
+                row['error'] = traceback.format_exc().strip().splitlines()[-1]
+            row['seconds'] = time.perf_counter() - start
+            return row
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            rows = list(executor.map(run, range(len(runs))))
+
+        columns = ['run'] + (['data_splits'] if named_splits is not None else [])
+        for _, configuration in runs:
+            columns.extend(k for k in configuration.keys() if k not in columns)
+        columns.extend(['result', 'error', 'seconds'])
+        self.results = SweepResults(rows, columns)
+        if not quiet:
+            print(self.results.format_table())
+
+    @staticmethod
+    def expand_configurations(configurations: Union[list[dict[str, Any]], dict[str, list[Any]]]) -> list[dict]:
+        """
+        Expand a grid of arguments (dictionary of argument lists) to all combinations, or return given list of
+        configurations unchanged.
+        :return: list of configurations
+        """
+        if isinstance(configurations, dict):
+            keys = list(configurations.keys())
+            return [dict(zip(keys, values)) for values in itertools.product(*(configurations[k] for k in keys))]
+        return list(configurations)
+
+    @staticmethod
+    def _copy_splits(splits: list[Any], deep: bool) -> list[Any]:
+        if deep:
+            return copy.deepcopy(splits)
+        return [[copy.copy(datasource) for datasource in node_data] if isinstance(node_data, list) else node_data
+                for node_data in splits]
+
+    @staticmethod
+    def _error_summary(errors: dict[tuple[str, str], Any]) -> Optional[str]:
+        if not errors:
+            return None
+        (role, _), error = next(iter(errors.items()))
+        lines = _ANSI_ESCAPES.sub('', str(error)).strip().splitlines()
+        return f"{'analyzer' if role == 'default' else role}: {lines[-1] if lines else error}"
@@ -1,11 +1,57 @@
 import pickle
 import threading
 import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import resource_tracker
+from multiprocessing.managers import BaseManager, ListProxy
 from typing import Any, Type, Literal, Optional, Union
 import traceback
 
 from flame.star import StarModel, StarLocalDPModel, StarAnalyzer, StarAggregator
-from flame.utils.mock_flame_core import MockFlameCoreSDK
+from flame.utils.mock_flame_core import (MockFlameCoreSDK, MockMessageBroker, MockLogStore, IterationTracker,
+                                         MockSimulation, SharedPayload, unlink_shared_message)
+
+
+class _SimulationManager(BaseManager):
+    """
+    Manager hosting the state shared by all nodes of a simulation run with the process backend.
+    """
+    pass
+
+
+_SimulationManager.register('MockMessageBroker', MockMessageBroker)
+_SimulationManager.register('MockLogStore', MockLogStore)
+_SimulationManager.register('IterationTracker', IterationTracker)
+_SimulationManager.register('list', list, ListProxy)
+
+
+def _run_node(kwargs: dict, model_class: Type[StarModel]) -> tuple[Any, Optional[Any]]:
+    """
+    Run a single node of the simulation.
+    :return: tuple of the node's final result and its error (None, if the node finished successfully)
+    """
+    try:
+        flame = model_class(**kwargs).flame
+        return flame.final_results_storage, None
+    except Exception:
+        simulation = kwargs['test_kwargs']['simulation']
+        if simulation.stop(kwargs['test_kwargs']['node_id']):
+            stack_trace = traceback.format_exc()
+            mock = MockFlameCoreSDK(test_kwargs=kwargs['test_kwargs'])
+            mock.__pop_logs__(failure_message=True)
+            return None, f"\033[31m{stack_trace}\033[0m"
+        else:
+            return None, Exception("Another thread already failed, stopping this thread as well.")
+
+
+def _release_unread_messages(message_broker: MockMessageBroker) -> None:
+    """
+    Remove the shared memory segments of messages left unread at the end of a simulation (e.g. results dropped by the
+    aggregator, or sent after it finished).
+    """
+    for message in message_broker.drain():
+        if isinstance(message, SharedPayload):
+            unlink_shared_message(message)
 
 
 class StarModelTester:
@@ -23,9 +69,20 @@ class StarModelTester:
                  aggregator_kwargs: Optional[dict] = None,
                  epsilon: Optional[float] = None,
                  sensitivity: Optional[float] = None,
-                 result_filepath: Optional[Union[str, list[str]]] = None) -> None:
+                 result_filepath: Optional[Union[str, list[str]]] = None,
+                 model_kwargs: Optional[dict] = None,
+                 backend: Literal['thread', 'process'] = 'thread',
+                 model_class: Optional[Type[StarModel]] = None,
+                 mock_kwargs: Optional[dict] = None,
+                 quiet: bool = False) -> None:
+        self.result: Optional[Any] = None
+        self.errors: dict[tuple[str, str], Any] = {}
+
         num_splits = len(data_splits)
-        self.test_input(data_splits[0])
+        if not quiet:
+            self.test_input(data_splits[0])
+        else:
+            mock_kwargs = {'print_logs': False, **(mock_kwargs or {})}  # suppress logs of every iteration
         participants = []
         if node_roles is not None and len(data_splits) != len(data_splits):
             raise ValueError(f"Length of node_roles ({len(node_roles)}) must be equal to length of data_splits "
@@ -37,10 +94,8 @@ class StarModelTester:
                 (node_roles[i] if i < len(node_roles) else 'aggregator')
             participants.append({'id': participant_id, 'role': participant_role})
 
-        threads = []
-        thread_errors = {}
-        results_queue = []
-        MockFlameCoreSDK.stop_event = []  # shared stop event for all threads in case of failure in any thread
+        node_kwargs = []
+        use_local_dp = (epsilon is not None) and (sensitivity is not None)
         for i, participant in enumerate(participants):
             participant_id = participant['id']
             participant_role = participant['role']
@@ -54,6 +109,7 @@ class StarModelTester:
                 'multiple_results': multiple_results,
                 'analyzer_kwargs': analyzer_kwargs,
                 'aggregator_kwargs': aggregator_kwargs,
+                **(model_kwargs or {}),
                 'test_mode': True,
                 'test_kwargs': {f'{data_type}_data': data_splits[i] if i < num_splits else None,
                                 'node_id': participant_id,
@@ -61,54 +117,94 @@ class StarModelTester:
                                 'participants': [part for j, part in enumerate(participants) if i != j],
                                 'role': participant_role,
                                 'analysis_id': "analysis_id",
-                                'project_id': "project_id"
+                                'project_id': "project_id",
+                                **(mock_kwargs or {})  # e.g. simulated send_latency and send_failure_rate
                                 }
             }
-            use_local_dp = (epsilon is not None) and (sensitivity is not None)
             if use_local_dp:
                 test_kwargs['epsilon'] = epsilon
                 test_kwargs['sensitivity'] = sensitivity
+            node_kwargs.append(test_kwargs)
 
-            def run_node(kwargs=test_kwargs, use_dp=use_local_dp):
-                try:
-                    if not use_dp:
-                        flame = StarModel(**kwargs).flame
-                    else:
-                        flame = StarLocalDPModel(**kwargs).flame
-                    results_queue.append(flame.final_results_storage)
-                except Exception:
-                    stop_event = MockFlameCoreSDK.stop_event
-                    if not stop_event:
-                        stack_trace = traceback.format_exc()
-                        thread_errors[(kwargs['test_kwargs']['role'],
-                                       kwargs['test_kwargs']['node_id'])] = f"\033[31m{stack_trace}\033[0m"
-                        stop_event.append(kwargs['test_kwargs']['node_id'])
-                        mock = MockFlameCoreSDK(test_kwargs=kwargs['test_kwargs'])
-                        mock.__pop_logs__(failure_message=True)
-                    else:
-                        thread_errors[(kwargs['test_kwargs']['role'],
-                                       kwargs['test_kwargs']['node_id'])] = (Exception("Another thread already failed, "
-                                                                                       "stopping this thread as well."))
-                    return
-
-            thread = threading.Thread(target=run_node)
-            threads.append(thread)
-
-        for thread in threads:
-            thread.start()
+        if model_class is None:
+            model_class = StarLocalDPModel if use_local_dp else StarModel
+        if backend == 'thread':
+            node_outcomes = self._run_threads(node_kwargs, model_class)
+        elif backend == 'process':
+            node_outcomes = self._run_processes(node_kwargs, model_class)
+        else:
+            raise ValueError(f"Unknown backend '{backend}' (expected 'thread' or 'process').")
 
-        for thread in threads:
-            thread.join()
+        thread_errors = {}
+        results = {}
+        for kwargs, (final_result, error) in zip(node_kwargs, node_outcomes):
+            if error is None:
+                results[kwargs['test_kwargs']['node_id']] = final_result
+            else:
+                thread_errors[(kwargs['test_kwargs']['role'], kwargs['test_kwargs']['node_id'])] = error
 
+        self.errors = thread_errors
 
         # write final results
-        if results_queue:
-            self.write_result(results_queue[0], output_type, result_filepath, multiple_results)
-        else:
+        if results:
+            aggregator_id = participants[-1]['id']
+            final_result = results[aggregator_id] if aggregator_id in results else next(iter(results.values()))
+            self.result = final_result
+            if (result_filepath is not None) or (not quiet):
+                self.write_result(final_result, output_type, result_filepath, multiple_results)
+        elif not quiet:
             print("No results to write. All threads failed with errors:")
             for (role, node_id), error in thread_errors.items():
                 print(f"\t{(role if role != 'default' else 'analyzer').capitalize()} {node_id}: {error}")
 
+    @staticmethod
+    def _with_simulation(node_kwargs: list[dict], simulation: MockSimulation) -> list[dict]:
+        return [{**kwargs, 'test_kwargs': {**kwargs['test_kwargs'], 'simulation': simulation}}
+                for kwargs in node_kwargs]
+
+    @staticmethod
+    def _run_threads(node_kwargs: list[dict], model_class: Type[StarModel]) -> list[tuple[Any, Optional[Any]]]:
+        # fresh shared state for all threads of this simulation
+        simulation = MockSimulation()
+        node_kwargs = StarModelTester._with_simulation(node_kwargs, simulation)
+
+        node_outcomes = [(None, None)] * len(node_kwargs)
+
+        def run_node(i: int) -> None:
+            node_outcomes[i] = _run_node(node_kwargs[i], model_class)
+
+        threads = [threading.Thread(target=run_node, args=(i,)) for i in range(len(node_kwargs))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        _release_unread_messages(simulation.message_broker)
+        return node_outcomes
+
+    @staticmethod
+    def _run_processes(node_kwargs: list[dict], model_class: Type[StarModel]) -> list[tuple[Any, Optional[Any]]]:
+        # shared state for all processes of this simulation, hosted by a manager process
+        resource_tracker.ensure_running()  # track shared memory segments of all processes in a single tracker
+        with _SimulationManager() as manager:
+            simulation = MockSimulation(message_broker=manager.MockMessageBroker(),
+                                        logger=manager.MockLogStore(),
+                                        num_iterations=manager.IterationTracker(),
+                                        stop_event=manager.list())
+            node_kwargs = StarModelTester._with_simulation(node_kwargs, simulation)
+            with ProcessPoolExecutor(max_workers=len(node_kwargs)) as executor:
+                futures = {executor.submit(_run_node, kwargs, model_class): i for i, kwargs in enumerate(node_kwargs)}
+                node_outcomes = [(None, None)] * len(node_kwargs)
+                for future in as_completed(futures):
+                    try:
+                        node_outcomes[futures[future]] = future.result()
+                    except Exception:
+                        # the node could not be run or its outcome not be returned (e.g. unpicklable arguments or
+                        # results), stop all other nodes
+                        simulation.stop(node_kwargs[futures[future]]['test_kwargs']['node_id'])
+                        node_outcomes[futures[future]] = (None, f"\033[31m{traceback.format_exc()}\033[0m")
+            _release_unread_messages(simulation.message_broker)
+        return node_outcomes
+
     @staticmethod
     def test_input(data: Any) -> None:
         is_list = isinstance(data, list)
@@ -0,0 +1 @@
+from flame.star.star_tree.star_tree_model import StarTreeModel
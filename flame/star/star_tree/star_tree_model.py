@@ -0,0 +1,151 @@
+from typing import Optional, Type, Literal, Union, Any
+
+from flamesdk import FlameCoreSDK
+from flame.star.aggregator_client import Aggregator
+from flame.star.analyzer_client import Analyzer
+from flame.star.star_model import StarModel, _STREAM_POLL_INTERVAL
+from flame.utils.codec import Codec
+from flame.utils.lazy_data import LazyNodeData
+from flame.utils.mock_flame_core import MockFlameCoreSDK
+
+
+class _SubtreeFlame:
+    """
+    View on the SDK of an analyzer node, presenting the node as aggregator of its subtree (i.e. with its children as
+    participants) to the aggregator instance merging the partial results of the subtree.
+    """
+    def __init__(self, flame: Union[FlameCoreSDK, MockFlameCoreSDK], children: list[str]) -> None:
+        self._flame = flame
+        self._children = children
+
+    def get_role(self) -> str:
+        return 'aggregator'
+
+    def get_participant_ids(self) -> list[str]:
+        return list(self._children)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._flame, name)
+
+
+class StarTreeModel(StarModel):
+    """
+    Variant of the StarModel aggregating results along a tree (analyzers -> sub-aggregating analyzers -> aggregator)
+    instead of sending all of them to the aggregator.
+
+    Analyzers are arranged in a tree of the given fan-in below the aggregator (ordered by their ids). Every analyzer
+    folds its own analysis result and the partial results of its children into a partial result (using an instance
+    of the aggregator class), which it sends to its parent. Hence, every node receives at most fan_in results per
+    round, and subtrees are merged in parallel with a depth of O(log(N)) for N analyzers. Aggregated results are
+    broadcast to all analyzers directly (see broadcast_workers).
+
+    The aggregator class has to implement the incremental aggregation API (init_aggregation, accumulate and
+    finalize_aggregation) as well as merge_states. Quorum rounds are not supported.
+    """
+    flame: Union[FlameCoreSDK, MockFlameCoreSDK]
+
+    data: Optional[Union[list[dict[str, Any]], LazyNodeData]] = None
+    test_mode: bool = False
+
+    fan_in: int = 8
+
+    def __init__(self,
+                 analyzer: Type[Analyzer],
+                 aggregator: Type[Aggregator],
+                 data_type: Literal['fhir', 's3'],
+                 query: Optional[Union[str, list[str]]] = None,
+                 simple_analysis: bool = True,
+                 output_type: Union[Literal['str', 'bytes', 'pickle'], list] = 'str',
+                 multiple_results: bool = False,
+                 analyzer_kwargs: Optional[dict] = None,
+                 aggregator_kwargs: Optional[dict] = None,
+                 fan_in: int = 8,
+                 lazy_data: bool = False,
+                 lazy_data_cache: bool = True,
+                 mmap_s3_data: bool = False,
+                 poll_interval: float = _STREAM_POLL_INTERVAL,
+                 codec: Optional[Codec] = None,
+                 delta_broadcast: bool = False,
+                 broadcast_workers: int = 1,
+                 send_attempts: int = 1,
+                 log_timings: bool = False,
+                 linger_timeout: Optional[float] = None,
+                 test_mode: bool = False,
+                 test_kwargs: Optional[dict] = None) -> None:
+        if fan_in < 1:
+            raise ValueError(f"fan_in must be at least 1 (given: {fan_in}).")
+        self.fan_in = fan_in
+        self._aggregator_class = aggregator
+        self._aggregator_kwargs = aggregator_kwargs
+        self._subtree_aggregator: Optional[Aggregator] = None
+        super().__init__(analyzer=analyzer,
+                         aggregator=aggregator,
+                         data_type=data_type,
+                         query=query,
+                         simple_analysis=simple_analysis,
+                         output_type=output_type,
+                         multiple_results=multiple_results,
+                         analyzer_kwargs=analyzer_kwargs,
+                         aggregator_kwargs=aggregator_kwargs,
+                         lazy_data=lazy_data,
+                         lazy_data_cache=lazy_data_cache,
+                         mmap_s3_data=mmap_s3_data,
+                         poll_interval=poll_interval,
+                         codec=codec,
+                         delta_broadcast=delta_broadcast,
+                         broadcast_workers=broadcast_workers,
+                         send_attempts=send_attempts,
+                         log_timings=log_timings,
+                         linger_timeout=linger_timeout,
+                         test_mode=test_mode,
+                         test_kwargs=test_kwargs)
+
+    def _tree(self) -> dict[str, tuple[Optional[str], list[str]]]:
+        """
+        Arrange the aggregator (root) and analyzers (ordered by id) as a complete tree with fan_in children per node.
+        :return: parent (None for the root) and children per node id
+        """
+        aggregator_id = self.flame.get_aggregator_id()
+        node_ids = [self.flame.get_id()] + self.flame.get_participant_ids()
+        ordered = [aggregator_id] + sorted(node_id for node_id in node_ids if node_id != aggregator_id)
+        return {node_id: (ordered[(position - 1) // self.fan_in] if position > 0 else None,
+                          ordered[position * self.fan_in + 1:(position + 1) * self.fan_in + 1])
+                for position, node_id in enumerate(ordered)}
+
+    def _aggregate_round(self,
+                         aggregator: Aggregator,
+                         analyzers: list[str],
+                         simple_analysis: bool = True) -> tuple[Any, bool]:
+        # Merge partial results of the subtrees below the aggregator, as they arrive
+        _, children = self._tree()[self.flame.get_id()]
+        partial_results = (partial_result for _, partial_result
+                           in self._stream_intermediate_data(children, aggregator.num_iterations))
+        return aggregator.aggregate_partial_results(partial_results, simple_analysis)
+
+    def _send_analysis_result(self, aggregator_id: str, analyzer_res: Any, current_round: int) -> None:
+        parent, children = self._tree()[self.flame.get_id()]
+        if self._subtree_aggregator is None:
+            subtree_flame = _SubtreeFlame(self.flame, children)
+            if self._aggregator_kwargs is None:
+                self._subtree_aggregator = self._aggregator_class(flame=subtree_flame)
+            else:
+                self._subtree_aggregator = self._aggregator_class(flame=subtree_flame, **self._aggregator_kwargs)
+            # record merging the subtree in the timings of this analyzer
+            self._subtree_aggregator.timer = self._timer
+
+        # Fold own result and the partial results of the subtrees below into a partial result, and send it upwards
+        subtree_aggregator = self._subtree_aggregator
+        with self._phase('aggregation'):
+            partial_result = subtree_aggregator.accumulate(subtree_aggregator.init_aggregation(), analyzer_res)
+        if children:  # (merges are timed by the subtree aggregator)
+            partial_result = subtree_aggregator.merge_partial_results(
+                partial_result,
+                (child_result for _, child_result in self._stream_intermediate_data(children, current_round)))
+        self._send([parent], self._pack(partial_result, current_round))
+
+    def _wait_until_partners_ready(self) -> None:
+        super()._wait_until_partners_ready()
+        if self._is_analyzer():
+            _, children = self._tree()[self.flame.get_id()]
+            if children and not all(self.flame.ready_check(children).values()):
+                raise BrokenPipeError("Could not contact all analyzers of subtree")
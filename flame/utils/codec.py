@@ -0,0 +1,178 @@
+import lzma
+import pickle
+import struct
+import threading
+import zlib
+from typing import Any, Callable, Literal, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Codec:
+    """
+    Base class for codecs used to encode intermediate results before they are sent, and to decode them after they are
+    received. The base class passes data through unchanged (i.e. leaves serialization to the SDK).
+    """
+    def encode(self, data: Any) -> Any:
+        return data
+
+    def decode(self, payload: Any) -> Any:
+        return payload
+
+
+class PickleCodec(Codec):
+    """
+    Codec serializing data with pickle, e.g. to encode a payload once and reuse the resulting buffer.
+    """
+    def encode(self, data: Any) -> bytes:
+        return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, payload: bytes) -> Any:
+        return pickle.loads(payload)
+
+
+class _ArrayRef:
+    """
+    Placeholder for a numpy array within the pickled structure of a NumpyCodec payload.
+    """
+    __slots__ = ('offset', 'dtype', 'shape')
+
+    def __init__(self, offset: int, dtype: str, shape: tuple[int, ...]) -> None:
+        self.offset = offset
+        self.dtype = dtype
+        self.shape = shape
+
+    def __reduce__(self) -> tuple:
+        return _ArrayRef, (self.offset, self.dtype, self.shape)
+
+
+_MAGIC = b'FLNP'
+_HEADER = struct.Struct('<4sBBI')  # magic, version, compression, length of pickled structure
+_VERSION = 2
+_ALIGNMENT = 64
+_COMPRESSION_IDS = {None: 0, 'zlib': 1, 'lzma': 2}
+
+
+class NumpyCodec(Codec):
+    """
+    Codec shipping numpy arrays (also nested in dicts, lists and tuples) as raw little-endian buffers.
+
+    The payload consists of a header, the pickled structure of the data (with each array replaced by a reference
+    holding its dtype and shape), and the array buffers. Every array buffer starts at a multiple of 64 bytes from the
+    start of the payload (or of the decompressed buffers), i.e. decoded arrays are aligned in memory as far as the
+    received payload is. Without compression, decoded arrays are read-only views on the received payload (zero-copy).
+    Arrays of dtype object are pickled as part of the structure.
+    """
+    def __init__(self,
+                 compression: Optional[Literal['zlib', 'lzma']] = None,
+                 compression_level: Optional[int] = None) -> None:
+        if np is None:
+            raise ImportError("NumpyCodec requires numpy to be installed.")
+        if compression not in _COMPRESSION_IDS:
+            raise ValueError(f"Unknown compression '{compression}' (expected one of {list(_COMPRESSION_IDS.keys())}).")
+        self.compression = compression
+        self.compression_level = compression_level
+
+    def encode(self, data: Any) -> bytes:
+        body = bytearray()
+        structure = self._extract_arrays(data, body)
+        pickled_structure = pickle.dumps(structure, protocol=pickle.HIGHEST_PROTOCOL)
+        body = self._compress(body)
+
+        header = _HEADER.pack(_MAGIC, _VERSION, _COMPRESSION_IDS[self.compression], len(pickled_structure))
+        padding = bytes(-(len(header) + len(pickled_structure)) % _ALIGNMENT)  # body starts at an aligned offset
+        return b''.join([header, pickled_structure, padding, body])
+
+    def decode(self, payload: bytes) -> Any:
+        magic, version, compression_id, structure_length = _HEADER.unpack_from(payload)
+        if magic != _MAGIC:
+            raise ValueError("Payload was not encoded with NumpyCodec.")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported NumpyCodec payload version {version} (expected {_VERSION}).")
+        structure_end = _HEADER.size + structure_length
+        structure = pickle.loads(memoryview(payload)[_HEADER.size:structure_end])
+
+        body = memoryview(payload)[structure_end + (-structure_end % _ALIGNMENT):]
+        if compression_id == _COMPRESSION_IDS['zlib']:
+            body = memoryview(zlib.decompress(body))
+        elif compression_id == _COMPRESSION_IDS['lzma']:
+            body = memoryview(lzma.decompress(body))
+
+        return self._insert_arrays(structure, body)
+
+    def _compress(self, body: bytearray) -> bytes:
+        if self.compression == 'zlib':
+            return zlib.compress(body, -1 if self.compression_level is None else self.compression_level)
+        elif self.compression == 'lzma':
+            return lzma.compress(body, preset=self.compression_level)
+        return bytes(body)
+
+    def _extract_arrays(self, data: Any, body: bytearray) -> Any:
+        if isinstance(data, np.ndarray) and (data.dtype != object):
+            array = np.asarray(data, dtype=data.dtype.newbyteorder('<'), order='C')  # keeps the shape of 0-d arrays
+            body += bytes(-len(body) % _ALIGNMENT)
+            offset = len(body)
+            body += memoryview(array.reshape(-1).view(np.uint8))
+            return _ArrayRef(offset, array.dtype.str, array.shape)
+        elif type(data) is dict:
+            return {k: self._extract_arrays(v, body) for k, v in data.items()}
+        elif type(data) is list:
+            return [self._extract_arrays(v, body) for v in data]
+        elif type(data) is tuple:
+            return tuple(self._extract_arrays(v, body) for v in data)
+        return data
+
+    def _insert_arrays(self, structure: Any, body: memoryview) -> Any:
+        if isinstance(structure, _ArrayRef):
+            dtype = np.dtype(structure.dtype)
+            count = int(np.prod(structure.shape, dtype=np.int64))
+            return np.frombuffer(body, dtype=dtype, count=count, offset=structure.offset).reshape(structure.shape)
+        elif type(structure) is dict:
+            return {k: self._insert_arrays(v, body) for k, v in structure.items()}
+        elif type(structure) is list:
+            return [self._insert_arrays(v, body) for v in structure]
+        elif type(structure) is tuple:
+            return tuple(self._insert_arrays(v, body) for v in structure)
+        return structure
+
+
+class PayloadCache:
+    """
+    Cache of encoded payloads keyed by the identity of the encoded object and the round, such that an object broadcast
+    several times within a round (e.g. the latest aggregated result resent to analyzers of stale results in
+    asynchronous mode) is encoded only once, and all broadcasts share the same buffer.
+
+    Only payloads of the latest round are kept. The cache holds a reference to every cached object, such that its
+    identity cannot be reused by another object while cached. Objects must not be modified within a round after they
+    have been encoded.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._round: Optional[int] = None
+        self._entries: dict[int, tuple[Any, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, data: Any, current_round: int, encode: Callable[[Any], Any]) -> Any:
+        """
+        Return the cached payload of data for the current round, or encode data and cache the payload.
+        :return: payload
+        """
+        with self._lock:
+            if current_round != self._round:
+                self._round, self._entries = current_round, {}
+            entry = self._entries.get(id(data))
+            if (entry is not None) and (entry[0] is data):
+                self.hits += 1
+                return entry[1]
+            payload = encode(data)
+            self._entries[id(data)] = (data, payload)
+            self.misses += 1
+            return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._round, self._entries = None, {}
@@ -0,0 +1,137 @@
+import reprlib
+import sys
+from itertools import islice
+from typing import Any, Optional
+
+from flame.utils.lazy_data import LazyNodeData
+
+
+class _BoundedRepr(reprlib.Repr):
+    """
+    reprlib.Repr, which also truncates binary data before rendering it (the default falls back to repr() of the
+    whole object, before cutting the result to size).
+    """
+    def __init__(self, max_length: int) -> None:
+        super().__init__()
+        self.maxstring = max_length
+        self.maxother = max_length
+        self.maxlist = self.maxtuple = self.maxset = self.maxdict = 4
+        self.maxlevel = 3
+
+    def repr_bytes(self, x: bytes, level: int) -> str:
+        if len(x) <= self.maxstring:
+            return repr(x)
+        return f"{repr(x[:self.maxstring])}..."
+
+    def repr_bytearray(self, x: bytearray, level: int) -> str:
+        return f"bytearray({self.repr_bytes(bytes(x[:self.maxstring + 1]), level)})"
+
+    def repr_memoryview(self, x: memoryview, level: int) -> str:
+        return f"memoryview({self.repr_bytes(x[:self.maxstring + 1].tobytes(), level)})"
+
+
+def format_size(num_bytes: int) -> str:
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if num_bytes < 1024 or unit == 'GB':
+            return f"{num_bytes:.0f} {unit}" if unit == 'B' else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+
+def _dataset_size(dataset: Any) -> Optional[str]:
+    if isinstance(dataset, (bytes, bytearray, memoryview)):
+        return format_size(len(dataset) if not isinstance(dataset, memoryview) else dataset.nbytes)
+    elif isinstance(dataset, str):
+        return f"{len(dataset)} chars"
+    elif isinstance(dataset, dict) and isinstance(dataset.get('entry'), list):
+        return f"{len(dataset['entry'])} entries"
+    return None
+
+
+def estimate_size(obj: Any) -> int:
+    """
+    Estimate the memory footprint of obj in bytes, including all objects it contains (each counted once). numpy
+    arrays and pandas objects are measured by their buffers.
+    :return: estimated size in bytes
+    """
+    seen_ids = set()
+    size = 0
+    pending = [obj]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen_ids:
+            continue
+        seen_ids.add(id(item))
+        if hasattr(item, 'memory_usage') and hasattr(item, 'columns'):  # pandas DataFrame
+            size += int(item.memory_usage(deep=True).sum())
+        elif hasattr(item, 'memory_usage') and hasattr(item, 'dtype'):  # pandas Series
+            size += int(item.memory_usage(deep=True))
+        elif hasattr(item, 'nbytes') and hasattr(item, 'dtype'):  # numpy array
+            size += int(item.nbytes)
+        elif isinstance(item, memoryview):
+            size += item.nbytes
+        else:
+            size += sys.getsizeof(item)
+            if isinstance(item, dict):
+                pending.extend(item.keys())
+                pending.extend(item.values())
+            elif isinstance(item, (list, tuple, set, frozenset)):
+                pending.extend(item)
+            elif hasattr(item, '__dict__') and not isinstance(item, type):
+                pending.append(item.__dict__)
+    return size
+
+
+def describe_data(data: Any, max_items: int = 10) -> dict[str, Any]:
+    """
+    Describe data in FLAME's node format (list of datasources, each a dictionary of datasets) without rendering it.
+    At most max_items datasources and datasets per datasource are described individually.
+    :return: dictionary with the number of datasources and, per datasource, its number of datasets and their sizes
+    """
+    if isinstance(data, LazyNodeData):
+        return {'type': type(data).__name__, 'keys': data.keys[:max_items]}
+    if not (isinstance(data, list) and all(isinstance(datasource, dict) for datasource in data)):
+        description = {'type': type(data).__name__}
+        if hasattr(data, '__len__'):
+            description['length'] = len(data)
+        return description
+    return {'num_datasources': len(data),
+            'datasources': [{'num_datasets': len(datasource),
+                             'datasets': {str(key): _dataset_size(dataset)
+                                          for key, dataset in islice(datasource.items(), max_items)}}
+                            for datasource in islice(data, max_items)]}
+
+
+def bounded_repr(obj: Any, max_length: int = 100) -> str:
+    """
+    Render obj like repr(), but without ever rendering more than max_length characters of any contained string or
+    binary value, and cut to max_length characters.
+    :return: truncated representation
+    """
+    return _BoundedRepr(max_length).repr(obj)[:max_length]
+
+
+def summarize_data(data: Any, max_length: int = 100) -> str:
+    """
+    Summarize data in a single line of bounded length, e.g. for logging. Sizes and counts are computed from the
+    data's structure, and the appended preview never renders more than max_length characters of any dataset.
+    :return: summary string
+    """
+    description = describe_data(data)
+    if 'num_datasources' in description:
+        datasource_summaries = []
+        for i, datasource in enumerate(description['datasources']):
+            datasets = ', '.join([f"{key} ({size})" if size is not None else key
+                                  for key, size in datasource['datasets'].items()])
+            if datasource['num_datasets'] > len(datasource['datasets']):
+                datasets += ', ...'
+            datasource_summaries.append(f"datasource {i}: {datasource['num_datasets']} dataset(s) [{datasets}]")
+        if description['num_datasources'] > len(description['datasources']):
+            datasource_summaries.append('...')
+        summary = f"{description['num_datasources']} datasource(s); {'; '.join(datasource_summaries)}"
+    else:
+        summary = f"data of type {description['type']}"
+        if 'length' in description:
+            summary += f" (length={description['length']})"
+        if 'keys' in description:
+            summary += f" (keys={description['keys']})"
+    return f"{summary} | preview: {bounded_repr(data, max_length)}"
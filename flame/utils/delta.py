@@ -0,0 +1,92 @@
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+_DELTA_KEY = '__delta__'
+_SPARSE_RATIO = 0.5  # arrays with a larger fraction of changed elements are sent in full
+
+
+def _is_array(obj: Any) -> bool:
+    return (np is not None) and isinstance(obj, np.ndarray)
+
+
+def _equal(a: Any, b: Any) -> bool:
+    if _is_array(a) or _is_array(b):
+        if not (_is_array(a) and _is_array(b)) or (a.shape != b.shape) or (a.dtype != b.dtype):
+            return False
+        return bool(np.array_equal(a, b, equal_nan=a.dtype.kind in 'fc'))
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return (a.keys() == b.keys()) and all(_equal(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)):
+        return (len(a) == len(b)) and all(_equal(x, y) for x, y in zip(a, b))
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+
+def compute_delta(previous: Any, current: Any) -> Any:
+    """
+    Compute a delta, from which apply_delta(previous, delta) reconstructs current exactly.
+
+    Unchanged values are omitted, dictionaries and equally long lists are compared item by item, and numpy arrays of
+    equal shape and dtype are encoded sparsely (flat indices and values of the changed elements), if less than half of
+    their elements changed. Any other changed value is included in full. Deltas consist of plain dictionaries, lists
+    and numpy arrays, such that they can be encoded with any codec.
+    :return: delta
+    """
+    if _equal(previous, current):
+        return {_DELTA_KEY: 'unchanged'}
+    if isinstance(previous, dict) and isinstance(current, dict) and (type(previous) is type(current)):
+        changed = {k: compute_delta(previous[k], v) if k in previous else {_DELTA_KEY: 'full', 'data': v}
+                   for k, v in current.items() if (k not in previous) or not _equal(previous[k], v)}
+        return {_DELTA_KEY: 'dict',
+                'changed': changed,
+                'removed': [k for k in previous.keys() if k not in current]}
+    if isinstance(previous, list) and isinstance(current, list) and (len(previous) == len(current)):
+        return {_DELTA_KEY: 'list',
+                'changed': {i: compute_delta(previous[i], v) for i, v in enumerate(current)
+                            if not _equal(previous[i], v)}}
+    if _is_array(previous) and _is_array(current) and (previous.shape == current.shape) and \
+            (previous.dtype == current.dtype) and (current.size > 0):
+        changed_mask = previous != current
+        if current.dtype.kind in 'fc':
+            changed_mask &= ~(np.isnan(previous) & np.isnan(current))
+        indices = np.flatnonzero(changed_mask)
+        if indices.size < _SPARSE_RATIO * current.size:
+            return {_DELTA_KEY: 'array', 'indices': indices, 'values': current.reshape(-1)[indices]}
+    return {_DELTA_KEY: 'full', 'data': current}
+
+
+def apply_delta(previous: Any, delta: Any) -> Any:
+    """
+    Reconstruct the current value from the previous value and a delta computed by compute_delta. The previous value
+    is not modified.
+    :return: current value
+    """
+    delta_type = delta[_DELTA_KEY]
+    if delta_type == 'unchanged':
+        return previous
+    elif delta_type == 'full':
+        return delta['data']
+    elif delta_type == 'dict':
+        current = {k: v for k, v in previous.items() if k not in delta['removed']}
+        for k, value_delta in delta['changed'].items():
+            current[k] = apply_delta(previous.get(k), value_delta)
+        return type(previous)(current) if type(previous) is not dict else current
+    elif delta_type == 'list':
+        current = list(previous)
+        for i, value_delta in delta['changed'].items():
+            current[i] = apply_delta(previous[i], value_delta)
+        return current
+    elif delta_type == 'array':
+        current = previous.copy()
+        current.reshape(-1)[delta['indices']] = delta['values']
+        return current
+    raise ValueError(f"Unknown delta type '{delta_type}'.")
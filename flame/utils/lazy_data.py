@@ -0,0 +1,167 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Iterator, Literal, Optional, Union
+
+from flamesdk import FlameCoreSDK
+from flame.utils.mapped_data import spill_s3_data
+from flame.utils.mock_flame_core import MockFlameCoreSDK
+
+
+class LazyDatasource(Mapping):
+    """
+    Read-only view of a single datasource within LazyNodeData. Datasets are only retrieved when accessed. Only keys
+    present in this datasource are listed, which requires every key to be retrieved once to find out whether it is
+    present (see LazyNodeData.has_dataset).
+    """
+    def __init__(self, node_data: 'LazyNodeData', index: int) -> None:
+        self._node_data = node_data
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        datasource = self._node_data.load(key)[self._index]
+        if key not in datasource:
+            raise KeyError(key)
+        return datasource[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._node_data.keys and self._node_data.has_dataset(key, self._index)
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in self._node_data.keys if self._node_data.has_dataset(key, self._index))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"LazyDatasource(index={self._index}, keys={list(self)!r})"
+
+
+class LazyNodeData(Sequence):
+    """
+    Lazy view of the data of a node, mirroring FLAME's data format (list of datasources, each a dictionary of datasets
+    with s3 keys or fhir queries as keys). Datasets are retrieved on demand, one key at a time, from get_s3_data or
+    get_fhir_data. If no keys/queries are given, they cannot be enumerated in advance and all data is retrieved on
+    first access instead.
+
+    With cache=False, retrieved datasets are not kept in memory, which allows to stream through datasets larger than
+    the available memory using iter_datasets(). Only the number of datasources and which keys are present in which
+    datasource are kept, every other access (e.g. data[i][key]) retrieves the dataset again. With mmap_s3_data=True, retrieved s3 datasets are spilled to
+    memory-mapped files (see spill_s3_data).
+    """
+    def __init__(self,
+                 flame: Union[FlameCoreSDK, MockFlameCoreSDK],
+                 data_type: Literal['fhir', 's3'],
+                 query: Optional[list[str]] = None,
+                 cache: bool = True,
+                 mmap_s3_data: bool = False) -> None:
+        self.flame = flame
+        self.data_type = data_type
+        self.keys = list(query) if query else []
+        self.cache = cache
+        self.mmap_s3_data = mmap_s3_data
+
+        self._num_datasources: Optional[int] = None
+        self._present: dict[str, list[bool]] = {}
+        self._loaded: dict[str, list[dict[str, Any]]] = {}
+        self._full_data: Optional[list[dict[str, Any]]] = None
+
+    def load(self, key: str) -> list[dict[str, Any]]:
+        """
+        Retrieve a single dataset from every datasource (or return it from the cache).
+        :return: list with a dictionary per datasource, containing the dataset if present in the datasource
+        """
+        if key in self._loaded:
+            return self._loaded[key]
+        if self.data_type == 'fhir':
+            data = self.flame.get_fhir_data([key])
+        else:
+            data = self.flame.get_s3_data([key])
+            if self.mmap_s3_data:
+                data = spill_s3_data(data)
+        self._num_datasources = len(data)
+        self._present[key] = [key in datasource for datasource in data]
+        if self.cache:
+            self._loaded[key] = data
+        return data
+
+    def has_dataset(self, key: str, index: int) -> bool:
+        """
+        Check whether the given datasource contains the dataset of the given key, retrieving it once if unknown.
+        :return: whether the dataset is present in the datasource
+        """
+        if key not in self._present:
+            self.load(key)
+        return self._present[key][index]
+
+    def release(self, key: Optional[str] = None) -> None:
+        """
+        Drop the given dataset (or all datasets, if no key is given) from the cache.
+        """
+        if key is None:
+            self._loaded.clear()
+            self._full_data = None
+        else:
+            self._loaded.pop(key, None)
+
+    def iter_datasets(self) -> Iterator[tuple[int, str, Any]]:
+        """
+        Iterate over all datasets one key at a time.
+        :return: iterator of (datasource index, key, dataset)
+        """
+        if not self.keys:
+            for i, datasource in enumerate(self._get_full_data()):
+                for key, dataset in datasource.items():
+                    yield i, key, dataset
+        else:
+            for key in self.keys:
+                for i, datasource in enumerate(self.load(key)):
+                    if key in datasource:
+                        yield i, key, datasource[key]
+
+    def materialize(self) -> list[dict[str, Any]]:
+        """
+        Retrieve all datasets at once.
+        :return: data in FLAME's data format
+        """
+        if not self.keys:
+            return self._get_full_data()
+        data = [{} for _ in range(len(self))]
+        for i, key, dataset in self.iter_datasets():
+            data[i][key] = dataset
+        return data
+
+    def _get_full_data(self) -> list[dict[str, Any]]:
+        if self._full_data is not None:
+            return self._full_data
+        if self.data_type == 'fhir':
+            data = self.flame.get_fhir_data(None)
+        else:
+            data = self.flame.get_s3_data(None)
+            if self.mmap_s3_data:
+                data = spill_s3_data(data)
+        self._num_datasources = len(data)
+        if self.cache:
+            self._full_data = data
+        return data
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if not self.keys:
+            return self._get_full_data()[index]
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not (0 <= index < len(self)):
+            raise IndexError(index)
+        return LazyDatasource(self, index)
+
+    def __len__(self) -> int:
+        if self._num_datasources is None:
+            if self.keys:
+                self.load(self.keys[0])
+            else:
+                self._get_full_data()
+        return self._num_datasources
+
+    def __repr__(self) -> str:
+        return (f"LazyNodeData(data_type={self.data_type!r}, keys={self.keys!r}, "
+                f"loaded={list(self._loaded.keys()) if self._full_data is None else 'all'})")
@@ -0,0 +1,80 @@
+import io
+import mmap
+import os
+import tempfile
+from typing import Any, Optional, Union
+
+
+def spill_to_mmap(payload: Union[bytes, bytearray, memoryview], spill_dir: Optional[str] = None) -> memoryview:
+    """
+    Write payload to a temporary file in spill_dir (default: system temp directory) and map it back into memory.
+    The file is unlinked right away, and is removed by the OS once the returned buffer is no longer referenced.
+    :return: read-only memoryview backed by the memory-mapped file
+    """
+    if len(payload) == 0:
+        return memoryview(b'')
+    fd, path = tempfile.mkstemp(prefix='flame_s3_', dir=spill_dir)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass  # e.g. on Windows, mapped files cannot be removed
+    return memoryview(mapped)
+
+
+def spill_s3_data(data: list[dict[str, Any]], spill_dir: Optional[str] = None) -> list[dict[str, Any]]:
+    """
+    Replace all binary datasets in s3 data (list of datasources, each a dictionary of datasets) by memory-mapped
+    buffers (see spill_to_mmap). Other values are left unchanged.
+    :return: data in the same format, holding memoryviews instead of bytes
+    """
+    return [{key: spill_to_mmap(dataset, spill_dir) if isinstance(dataset, (bytes, bytearray)) else dataset
+             for key, dataset in datasource.items()} if isinstance(datasource, dict) else datasource
+            for datasource in data]
+
+
+class _BufferReader(io.RawIOBase):
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview]) -> None:
+        self._buffer = memoryview(buffer).cast('B')
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        size = max(0, min(len(b), len(self._buffer) - self._position))  # 0 at (or after seeking past) the end
+        b[:size] = self._buffer[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        else:
+            position = len(self._buffer) + offset
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._position = position
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+
+def as_file(buffer: Union[bytes, bytearray, memoryview]) -> io.BufferedReader:
+    """
+    Wrap a binary dataset (e.g. a memory-mapped buffer from spill_to_mmap) in a read-only file object, without
+    copying it as a whole (unlike io.BytesIO(buffer)). Can be passed to e.g. pandas.read_csv or pandas.read_parquet.
+    :return: binary file object
+    """
+    return io.BufferedReader(_BufferReader(buffer))
@@ -1,7 +1,11 @@
+import pickle
+import random
+import threading
 import time
 from enum import Enum
 from httpx import AsyncClient
 from io import StringIO
+from multiprocessing.shared_memory import SharedMemory
 from typing import Any, Literal, Optional, Union
 
 from opendp.mod import enable_features
@@ -55,27 +59,327 @@ class IterationTracker:
         return self.iter
 
 
+class MockLogStore:
+    """
+    Log buffers of all mocked nodes of a simulation, printed and emptied at the end of every iteration.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._logs: dict[str, list[str]] = {}
+
+    def register(self, node_id: str, role: str) -> None:
+        with self._lock:
+            self._logs[node_id] = [role, '']
+
+    def append(self, node_id: str, log: str) -> None:
+        with self._lock:
+            self._logs[node_id][1] += log
+
+    def pop_all(self) -> list[tuple[str, str, str]]:
+        """
+        Empty all log buffers.
+        :return: list of (node_id, role, log)
+        """
+        with self._lock:
+            logs = [(node_id, role, log) for node_id, (role, log) in self._logs.items()]
+            for node_id, role, _ in logs:
+                self._logs[node_id] = [role, '']
+            return logs
+
+
+class SharedPayload:
+    """
+    Handle of a message placed in a shared memory segment, which is passed through the message broker instead of the
+    message itself (message_transport='shared_memory'). The segment holds the pickled message, followed by its
+    out-of-band buffers (e.g. the data of numpy arrays).
+    """
+    __slots__ = ('name', 'sizes')
+
+    def __init__(self, name: str, sizes: list[int]) -> None:
+        self.name = name
+        self.sizes = sizes  # size of the pickled message, and of every out-of-band buffer
+
+    def __reduce__(self) -> tuple:
+        return SharedPayload, (self.name, self.sizes)
+
+    @property
+    def size(self) -> int:
+        return sum(self.sizes)
+
+
+def encode_message(message: Any) -> tuple[bytes, list[memoryview]]:
+    """
+    Pickle a message, keeping large buffers (e.g. the data of numpy arrays) out-of-band instead of copying them into
+    the pickled bytes.
+    :return: tuple of the pickled message and its out-of-band buffers
+    """
+    buffers = []
+    pickled = pickle.dumps(message, protocol=5, buffer_callback=buffers.append)
+    return pickled, [buffer.raw() for buffer in buffers]
+
+
+def share_message(message: Any) -> SharedPayload:
+    """
+    Encode a message into a new shared memory segment (copying its buffers only once).
+    :return: handle of the segment
+    """
+    pickled, buffers = encode_message(message)
+    sizes = [len(pickled)] + [buffer.nbytes for buffer in buffers]
+    segment = SharedMemory(create=True, size=max(sum(sizes), 1))
+    try:
+        offset = 0
+        for chunk in [pickled] + buffers:
+            segment.buf[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+        return SharedPayload(segment.name, sizes)
+    finally:
+        segment.close()
+
+
+def read_shared_message(handle: SharedPayload) -> Any:
+    """
+    Decode the message of a shared memory segment (without removing the segment).
+    :return: message
+    """
+    segment = SharedMemory(name=handle.name)
+    try:
+        offset = handle.sizes[0]
+        buffers = []
+        for size in handle.sizes[1:]:
+            buffers.append(bytearray(segment.buf[offset:offset + size]))
+            offset += size
+        return pickle.loads(segment.buf[:handle.sizes[0]], buffers=buffers)
+    finally:
+        segment.close()
+
+
+def unlink_shared_message(handle: SharedPayload) -> None:
+    try:
+        segment = SharedMemory(name=handle.name)
+    except FileNotFoundError:
+        return
+    segment.close()
+    segment.unlink()
+
+
+class MockMailbox:
+    """
+    Inbox of a single mocked node, indexed by (category, sender).
+
+    Only the latest message per sender and category is retained (later messages overwrite earlier ones), which
+    mirrors how the node consumes them. A node awaiting a set of senders registers them as outstanding, so that every
+    delivery only has to check a single sender instead of rescanning the inbox. The node is woken once no sender is
+    outstanding anymore.
+    """
+    def __init__(self) -> None:
+        self.condition = threading.Condition()
+        self.messages: dict[tuple[str, str], Any] = {}
+        self.finished: bool = False
+        self.awaited_category: Optional[str] = None
+        self.outstanding_senders: set[str] = set()
+
+
+class MockMessageBroker:
+    """
+    In-memory message broker shared by all mocked nodes of a simulation.
+
+    Every node owns a mailbox guarded by its own condition variable. Delivering a message only wakes the receiving
+    node once all of its awaited senders have delivered, and waiting nodes otherwise sleep until the analysis is
+    finished, the simulation is interrupted or their timeout expires.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._mailboxes: dict[str, MockMailbox] = {}
+        self._interrupted = False
+        self._segment_readers: dict[str, int] = {}  # remaining readers per shared memory segment
+
+    def register(self, node_id: str) -> None:
+        self._get_mailbox(node_id)
+
+    def _get_mailbox(self, node_id: str) -> MockMailbox:
+        with self._lock:
+            if node_id not in self._mailboxes:
+                self._mailboxes[node_id] = MockMailbox()
+            return self._mailboxes[node_id]
+
+    def deliver(self, receiver: str, sender: str, message_category: str, message: Any) -> Optional[Any]:
+        """
+        Place a message in the mailbox of the receiver.
+        :return: the unread message of the same sender and category it replaces (None, if there was none)
+        """
+        mailbox = self._get_mailbox(receiver)
+        with mailbox.condition:
+            if message_category == 'analysis_finished':
+                mailbox.finished = True
+                mailbox.condition.notify_all()
+                return None
+            replaced = mailbox.messages.get((message_category, sender))
+            mailbox.messages[(message_category, sender)] = message
+            if (message_category == mailbox.awaited_category) and (sender in mailbox.outstanding_senders):
+                mailbox.outstanding_senders.discard(sender)
+                if not mailbox.outstanding_senders:
+                    mailbox.condition.notify_all()
+            return replaced
+
+    def wait(self,
+             node_id: str,
+             senders: list[str],
+             message_category: str,
+             timeout: Optional[float] = None) -> bool:
+        """
+        Block until messages of the given category from all senders are available, the analysis has been finished,
+        the simulation is interrupted, or the timeout expires.
+        :return: whether the analysis has been finished
+        """
+        mailbox = self._get_mailbox(node_id)
+        with mailbox.condition:
+            mailbox.awaited_category = message_category
+            mailbox.outstanding_senders = {sender for sender in senders
+                                           if (message_category, sender) not in mailbox.messages}
+            mailbox.condition.wait_for(lambda: mailbox.finished or
+                                               (not mailbox.outstanding_senders) or
+                                               self._interrupted,
+                                       timeout=timeout)
+            mailbox.awaited_category = None
+            mailbox.outstanding_senders = set()
+            return mailbox.finished
+
+    def collect(self, node_id: str, senders: list[str], message_category: str) -> dict[str, Any]:
+        """
+        Remove and return the available messages of the given category from the given senders.
+        """
+        mailbox = self._get_mailbox(node_id)
+        with mailbox.condition:
+            return {sender: mailbox.messages.pop((message_category, sender)) for sender in senders
+                    if (message_category, sender) in mailbox.messages}
+
+    def retain_segment(self, name: str, num_readers: int) -> None:
+        """
+        Register the number of receivers, which have to read a shared memory segment before it may be removed.
+        """
+        with self._lock:
+            self._segment_readers[name] = self._segment_readers.get(name, 0) + num_readers
+
+    def release_segment(self, name: str) -> bool:
+        """
+        Register that a receiver has read (or discarded) a shared memory segment.
+        :return: whether it was the last reader, i.e. the segment should be removed
+        """
+        with self._lock:
+            self._segment_readers[name] -= 1
+            if self._segment_readers[name] > 0:
+                return False
+            del self._segment_readers[name]
+            return True
+
+    def drain(self) -> list[Any]:
+        """
+        Remove and return all unread messages (e.g. to release their shared memory segments after a simulation).
+        """
+        with self._lock:
+            mailboxes = list(self._mailboxes.values())
+        messages = []
+        for mailbox in mailboxes:
+            with mailbox.condition:
+                messages.extend(mailbox.messages.values())
+                mailbox.messages.clear()
+        return messages
+
+    def interrupt(self) -> None:
+        """
+        Wake up every waiting node and stop further waiting, e.g. to let nodes observe a stop event.
+        """
+        with self._lock:
+            self._interrupted = True
+            mailboxes = list(self._mailboxes.values())
+        for mailbox in mailboxes:
+            with mailbox.condition:
+                mailbox.condition.notify_all()
+
+
+class MockSimulation:
+    """
+    State shared by all mocked nodes of a single simulation (message broker, logs, iteration counter and stop event).
+
+    Every simulation owns its own context, such that several simulations may run concurrently within a process. The
+    context is given to the mocked nodes under the key 'simulation' of test_kwargs (nodes without one share a default
+    context). For simulations spanning several processes, the context holds proxies of the shared objects.
+    """
+    def __init__(self,
+                 message_broker: Optional[MockMessageBroker] = None,
+                 logger: Optional[MockLogStore] = None,
+                 num_iterations: Optional[IterationTracker] = None,
+                 stop_event: Optional[list[str]] = None) -> None:
+        self.message_broker = message_broker if message_broker is not None else MockMessageBroker()
+        self.logger = logger if logger is not None else MockLogStore()
+        self.num_iterations = num_iterations if num_iterations is not None else IterationTracker()
+        # ids of failed nodes, set to stop all other nodes in case of failure in any node
+        self.stop_event = stop_event if stop_event is not None else []
+
+    def stop(self, node_id: str) -> bool:
+        """
+        Set the stop event on failure of a node, and wake up all nodes awaiting messages.
+        :return: whether the stop event was set by this call (i.e. the node failed first)
+        """
+        if self.stop_event:
+            return False
+        self.stop_event.append(node_id)
+        self.message_broker.interrupt()
+        return True
+
+
+_DEFAULT_SIMULATION = MockSimulation()
+
+
 class MockFlameCoreSDK:
-    num_iterations: IterationTracker = IterationTracker()
-    logger: dict[str, list[str]] = {}
-    message_broker: dict[str, list[dict[str, Any]]] = {}
-    final_results_storage: Optional[Any] = None
-    stop_event: list[tuple[str]] = []
+    simulation: MockSimulation
+    final_results_storage: Optional[Any]
 
     def __init__(self, test_kwargs):
         self.sanity_check(test_kwargs)
         self.config = MockConfig(test_kwargs)
+        self.simulation = test_kwargs.get('simulation') or _DEFAULT_SIMULATION
+        self.final_results_storage = None
         self.data = test_kwargs.get('fhir_data') or test_kwargs.get('s3_data')
-        self.logger[self.get_id()] = [self.get_role(), '']
+        self.logger.register(self.get_id(), self.get_role())
 
         self._test_kwargs = test_kwargs
         self.progress = 0
         self.incoming_message_queue = []
         self.outgoing_message_queue = []
-
-        node_id = self.get_id()
-        if node_id not in self.message_broker:
-            self.message_broker[node_id] = []
+        self._broadcast_lock = threading.Lock()
+        # simulated network: latency per sent message (in seconds) and probability of a send attempt failing
+        self.send_latency: float = test_kwargs.get('send_latency', 0)
+        self.send_failure_rate: float = test_kwargs.get('send_failure_rate', 0)
+        self._pending_receivers = set(self.get_participant_ids())
+        # message transport: pass references to messages (like threads sharing memory), or place encoded messages in
+        # shared memory segments and pass their handles (representative of the serialization in production)
+        self.message_transport: Literal['reference', 'shared_memory'] = test_kwargs.get('message_transport',
+                                                                                        'reference')
+        if self.message_transport not in ('reference', 'shared_memory'):
+            raise ValueError(f"Unknown message_transport '{self.message_transport}' (expected 'reference' or "
+                             f"'shared_memory').")
+        self.report_message_sizes: bool = test_kwargs.get('report_message_sizes', False)
+        self.sent_bytes = 0  # encoded size of all messages sent (only counted if reported or shared)
+        self.print_logs: bool = test_kwargs.get('print_logs', True)
+
+        self.message_broker.register(self.get_id())
+
+    @property
+    def message_broker(self) -> MockMessageBroker:
+        return self.simulation.message_broker
+
+    @property
+    def logger(self) -> MockLogStore:
+        return self.simulation.logger
+
+    @property
+    def num_iterations(self) -> IterationTracker:
+        return self.simulation.num_iterations
+
+    @property
+    def stop_event(self) -> list[str]:
+        return self.simulation.stop_event
 
     def sanity_check(self, test_kwargs) -> None:
         required_kwargs_check = all([k in test_kwargs.keys() for k in _REQUIRED_KWARGS])
@@ -138,7 +442,7 @@ class MockFlameCoreSDK:
             color = str(_LOG_TYPE_LITERALS[log_type][1])
         else:
             color = str(_LOG_TYPE_LITERALS['normal'][1])
-        self.logger[self.get_id()][1] += f"\033[{color}m{msg}\033[0m{end}"
+        self.logger.append(self.get_id(), f"\033[{color}m{msg}\033[0m{end}")
 
     def declare_log_types(self, new_log_types: dict[str, str]) -> None:
         pass
@@ -181,17 +485,50 @@ class MockFlameCoreSDK:
                      timeout: Optional[int] = None,
                      attempt_timeout: int = 10) -> tuple[list[str], list[str]]:
         sender = self.get_id()
-        for r in receivers:
-            if r not in self.message_broker.keys():
-                self.message_broker[r] = []
-            inbox = self.message_broker[r]
-            inbox.append({
-                "category": message_category,
-                "sender": sender,
-                "data": message,
-            })
-            self.message_broker[r] = inbox
-        return receivers, []
+        handle, size = None, None
+        if message_category != 'analysis_finished':
+            if self.message_transport == 'shared_memory':
+                # encode once for all receivers, the segment is removed by its last reader
+                handle = share_message(message)
+                size = handle.size
+                message = handle
+                self.message_broker.retain_segment(handle.name, len(receivers))
+            elif self.report_message_sizes:
+                pickled, buffers = encode_message(message)
+                size = len(pickled) + sum(buffer.nbytes for buffer in buffers)
+
+        successful, failed = [], []
+        for r in receivers:  # messages are sent one after another, each taking send_latency
+            for _ in range(max_attempts):
+                if self.send_latency:
+                    time.sleep(self.send_latency)
+                if random.random() >= self.send_failure_rate:
+                    replaced = self.message_broker.deliver(r, sender, message_category, message)
+                    self._release_message(replaced)  # unread message overwritten by the new one
+                    successful.append(r)
+                    break
+            else:
+                failed.append(r)
+                self._release_message(handle)
+
+        if size is not None:
+            self.sent_bytes += size * len(successful)
+            if self.report_message_sizes:
+                self.flame_log(f"\tSent {message_category} ({size} bytes) to {len(successful)} "
+                               f"receiver(s)", log_type='debug')
+        return successful, failed
+
+    def _release_message(self, message: Any) -> None:
+        if isinstance(message, SharedPayload) and self.message_broker.release_segment(message.name):
+            unlink_shared_message(message)
+
+    def _read_message(self, message: Any) -> Any:
+        if isinstance(message, SharedPayload):
+            try:
+                return read_shared_message(message)
+            finally:
+                self._release_message(message)
+        return message
 
     def await_messages(self,
                        senders: list[str],
@@ -207,37 +544,15 @@ class MockFlameCoreSDK:
 
         node_id = self.get_id()
 
-        while True:
-            try:
-                inbox = self.message_broker.get(node_id, [])
-                if inbox:
-                    finished_messages = [msg for msg in inbox if msg["category"] == 'analysis_finished']
-                    if finished_messages:
-                        self._node_finished()
-                        break
-
-                    msg_senders = [msg["sender"] for msg in inbox if msg["category"] == message_category]
-                    if all(sender in msg_senders for sender in senders):
-                        break
-                raise KeyError
-            except KeyError:
-                if self.stop_event:
-                    raise Exception
-                time.sleep(.01)
-                pass
+        # like the SDK, wait for messages of all senders (or until the timeout expires), and return those available
+        if self.message_broker.wait(node_id, senders, message_category, timeout=timeout):
+            self._node_finished()
+        elif self.stop_event:
+            raise Exception
 
         if not self.config.finished:
-            remaining_msgs = []
-            latest_results = {}
-            for msg in inbox:
-                if (msg["category"] == message_category) and (msg["sender"] in senders):
-                    latest_results[msg["sender"]] = msg["data"]
-                else:
-                    remaining_msgs.append(msg)
-
-            # retain only unconsumed messages
-            self.message_broker[node_id] = remaining_msgs
-            return latest_results
+            return {sender: self._read_message(message)
+                    for sender, message in self.message_broker.collect(node_id, senders, message_category).items()}
         else:
             return {self.config.aggregator_id: None}
 
@@ -308,14 +623,19 @@ class MockFlameCoreSDK:
                                timeout: Optional[int] = None,
                                attempt_timeout: int = 10,
                                encrypted: bool = False) -> tuple[list[str], list[str]]:
-        receivers, _ = self.send_message(receivers=receivers,
-                                         message_category=message_category,
-                                         message=data,
-                                         max_attempts=max_attempts,
-                                         timeout=timeout,)
+        successful, failed = self.send_message(receivers=receivers,
+                                               message_category=message_category,
+                                               message=data,
+                                               max_attempts=max_attempts,
+                                               timeout=timeout,)
         if self.get_id() == self.get_aggregator_id():
-            self.__pop_logs__()
-        return receivers, []
+            # an iteration ends, once the aggregator has sent to every analyzer (possibly in several sends)
+            with self._broadcast_lock:
+                self._pending_receivers.difference_update(successful)
+                if not self._pending_receivers:
+                    self.__pop_logs__()
+                    self._pending_receivers = set(self.get_participant_ids())
+        return successful, failed
 
     def await_intermediate_data(self,
                                 senders: list[str],
@@ -335,30 +655,35 @@ class MockFlameCoreSDK:
 
     def get_fhir_data(self, fhir_queries: Optional[list[str]] = None) -> Optional[list[Union[dict[str, dict], dict]]]:
         if 'fhir_data' in self._test_kwargs.keys():
-            return self.data
+            return self._select_data(fhir_queries)
         else:
             raise ValueError("No FHIR data provided in test_kwargs.")
 
     def get_s3_data(self, s3_keys: Optional[list[str]] = None) -> Optional[list[Union[dict[str, str], str]]]:
         if 's3_data' in self._test_kwargs.keys():
-            return self.data
+            return self._select_data(s3_keys)
         else:
             raise ValueError("No S3 data provided in test_kwargs.")
 
+    def _select_data(self, keys: Optional[list[str]] = None) -> Any:
+        if keys and isinstance(self.data, list) and all(isinstance(datasource, dict) for datasource in self.data):
+            return [{k: v for k, v in datasource.items() if k in keys} for datasource in self.data]
+        return self.data
+
     def _node_finished(self) -> bool:
         self.config.finished = True
         return self.config.finished
 
     def __pop_logs__(self, failure_message: bool = False) -> None:
-        print(f"--- Starting Iteration {self.__get_iteration__()} ---")
         if failure_message:
             self.flame_log("Exception was raised (see Stacktrace)!", log_type='error')
-        for k, v in self.logger.items():
-            role, log = self.logger[k]
-            print(f"Logs for {'Analyzer' if role == 'default' else role.capitalize()} {k}:")
-            self.logger[k] = [role, '']
-            print(log, end='')
-        print(f"--- Ending Iteration {self.__get_iteration__()} ---\n")
+        logs = self.logger.pop_all()
+        if self.print_logs:
+            print(f"--- Starting Iteration {self.__get_iteration__()} ---")
+            for k, role, log in logs:
+                print(f"Logs for {'Analyzer' if role == 'default' else role.capitalize()} {k}:")
+                print(log, end='')
+            print(f"--- Ending Iteration {self.__get_iteration__()} ---\n")
         self.num_iterations.increment()
 
     def __get_iteration__(self):
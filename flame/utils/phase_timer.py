@@ -0,0 +1,122 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from flame.utils.data_summary import estimate_size, format_size
+
+
+def payload_size(payload: Any, deep: bool = False) -> Optional[int]:
+    """
+    Size of a payload in bytes, taken directly from buffers (bytes, bytearray, memoryview, numpy arrays) or from a
+    dict, list or tuple of buffers. The size of any other payload is only estimated with deep=True (see estimate_size),
+    as walking its object graph may take longer than sending it.
+    :return: size in bytes (None, if it was not estimated)
+    """
+    size = _buffer_size(payload)
+    if size is None and isinstance(payload, (dict, list, tuple)):
+        size = 0
+        for item in (payload.values() if isinstance(payload, dict) else payload):
+            item_size = _buffer_size(item)
+            if item_size is None:  # stop at the first item that is no buffer
+                size = None
+                break
+            size += item_size
+    if size is None and deep:
+        size = estimate_size(payload)
+    return size
+
+
+def _buffer_size(obj: Any) -> Optional[int]:
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    elif isinstance(obj, memoryview) or (hasattr(obj, 'nbytes') and hasattr(obj, 'dtype')):
+        return int(obj.nbytes)
+    return None
+
+
+class IterationTimings:
+    """
+    Timing record of a single iteration of a node: time spent per phase (in seconds, summed over repeated phases) and
+    sizes of the payloads sent and received (in bytes, see payload_size). Times are taken from time.monotonic.
+    """
+    def __init__(self, node_id: str, role: str, iteration: int) -> None:
+        self.node_id = node_id
+        self.role = role
+        self.iteration = iteration
+        self.start = time.monotonic()
+        self.end: Optional[float] = None
+        self.phases: dict[str, float] = {}
+        self.payload_sizes: dict[str, int] = {'sent': 0, 'received': 0}
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.monotonic()) - self.start
+
+    def to_dict(self) -> dict[str, Any]:
+        return {'node_id': self.node_id,
+                'role': self.role,
+                'iteration': self.iteration,
+                'start': self.start,
+                'end': self.end,
+                'duration': self.duration,
+                'phases': dict(self.phases),
+                'payload_sizes': dict(self.payload_sizes)}
+
+    def __str__(self) -> str:
+        phases = ', '.join(f"{name} {1000 * seconds:.1f} ms" for name, seconds in self.phases.items())
+        return (f"Timings of iteration {self.iteration}: {1000 * self.duration:.1f} ms ({phases}), "
+                f"sent {format_size(self.payload_sizes['sent'])}, "
+                f"received {format_size(self.payload_sizes['received'])}")
+
+
+class PhaseTimer:
+    """
+    Per-iteration timing of the phases of a node (e.g. awaiting data, analysis, serialization). Phases are timed with
+    the phase context manager and recorded in the current iteration, which is started implicitly and closed with
+    end_iteration. Closed iterations are kept in records.
+    """
+    def __init__(self, node_id: str, role: str) -> None:
+        self.node_id = node_id
+        self.role = role
+        self.records: list[IterationTimings] = []
+        self._current: Optional[IterationTimings] = None
+        self._lock = threading.Lock()  # phases and payloads may be recorded from worker threads (e.g. broadcasts)
+
+    @property
+    def current(self) -> IterationTimings:
+        with self._lock:
+            if self._current is None:
+                self._current = IterationTimings(self.node_id, self.role, len(self.records))
+            return self._current
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        record = self.current
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                record.phases[name] = record.phases.get(name, 0.0) + elapsed
+
+    def add_payload(self, direction: str, size: int) -> None:
+        """
+        Add the size of payloads sent (direction='sent') or received (direction='received') to the current iteration.
+        """
+        record = self.current
+        with self._lock:
+            record.payload_sizes[direction] = record.payload_sizes.get(direction, 0) + size
+
+    def end_iteration(self) -> IterationTimings:
+        """
+        Close the current iteration.
+        :return: its timing record
+        """
+        record = self.current
+        with self._lock:
+            record.end = time.monotonic()
+            self.records.append(record)
+            self._current = None
+        return record
@@ -0,0 +1,359 @@
+import bisect
+import math
+import numbers
+import random
+from typing import Any, Iterable, Optional, TypeVar, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+_SketchType = TypeVar('_SketchType', bound='Sketch')
+
+
+class Sketch:
+    """
+    Base class for mergeable summaries of data. Analyzers update a sketch with their local data in a single pass and
+    send it to the aggregator, which merges the sketches of all analyzers into the summary of the federated data.
+    """
+    def update(self: _SketchType, values: Iterable[Any]) -> _SketchType:
+        """
+        Add values to the sketch (in place).
+        :return: self
+        """
+        raise NotImplementedError
+
+    def merge(self: _SketchType, other: _SketchType) -> _SketchType:
+        """
+        Merge another sketch of the same type and configuration into this one (in place).
+        :return: self
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def merge_all(cls: type[_SketchType], sketches: Iterable[_SketchType]) -> _SketchType:
+        """
+        Merge sketches (e.g. received from all analyzers) into a new sketch, leaving the given ones unchanged.
+        :return: merged sketch
+        """
+        sketches = list(sketches)
+        if not sketches:
+            raise ValueError(f"At least one {cls.__name__} is required for merging.")
+        merged = sketches[0].copy()
+        for sketch in sketches[1:]:
+            merged.merge(sketch)
+        return merged
+
+    def copy(self: _SketchType) -> _SketchType:
+        raise NotImplementedError
+
+    def _check_type(self, other: 'Sketch') -> None:
+        if type(other) is not type(self):
+            raise ValueError(f"Unable to merge {type(other).__name__} into {type(self).__name__}.")
+
+
+def _as_values(values: Iterable[Any]) -> Any:
+    """
+    Convert numeric values (None for missing values) to a float64 numpy array, or a list of floats without numpy.
+    """
+    if np is not None:
+        if not (hasattr(values, '__array__') or isinstance(values, (list, tuple))):
+            values = list(values)
+        return np.asarray(values, dtype=np.float64)
+    return [math.nan if v is None else float(v) for v in values]
+
+
+class CountSketch(Sketch):
+    """
+    Number of values (excluding missing values, i.e. None and NaN).
+    """
+    def __init__(self) -> None:
+        self.count = 0
+        self.missing = 0
+
+    def update(self, values: Iterable[Any]) -> 'CountSketch':
+        for v in values:
+            if (v is None) or (isinstance(v, numbers.Real) and math.isnan(v)):  # also numpy floats
+                self.missing += 1
+            else:
+                self.count += 1
+        return self
+
+    def merge(self, other: 'CountSketch') -> 'CountSketch':
+        self._check_type(other)
+        self.count += other.count
+        self.missing += other.missing
+        return self
+
+    def copy(self) -> 'CountSketch':
+        sketch = CountSketch()
+        sketch.count, sketch.missing = self.count, self.missing
+        return sketch
+
+
+class SumSketch(Sketch):
+    """
+    Sum of numeric values (NaN values are ignored).
+    """
+    def __init__(self) -> None:
+        self.total = 0.0
+
+    def update(self, values: Iterable[Any]) -> 'SumSketch':
+        values = _as_values(values)
+        if np is not None:
+            self.total += float(np.nansum(values))
+        else:
+            self.total += math.fsum(v for v in values if not math.isnan(v))
+        return self
+
+    def merge(self, other: 'SumSketch') -> 'SumSketch':
+        self._check_type(other)
+        self.total += other.total
+        return self
+
+    def copy(self) -> 'SumSketch':
+        sketch = SumSketch()
+        sketch.total = self.total
+        return sketch
+
+
+class MomentsSketch(Sketch):
+    """
+    Count, mean, variance, minimum and maximum of numeric values (NaN values are ignored). Batches of values are
+    summarized with numerically stable two-pass moments, which are combined with Chan et al.'s parallel update (the
+    pairwise form of Welford's algorithm), both within analyzers and when merging sketches.
+    """
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared differences from the mean
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def variance(self) -> float:
+        """
+        Sample variance (with Bessel's correction), NaN for fewer than two values.
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def update(self, values: Iterable[Any]) -> 'MomentsSketch':
+        values = _as_values(values)
+        if np is not None:
+            values = values[~np.isnan(values)]
+            count = int(values.size)
+            if count == 0:
+                return self
+            mean = float(values.mean())
+            m2 = float(np.square(values - mean).sum())
+            batch_min, batch_max = float(values.min()), float(values.max())
+        else:
+            values = [v for v in values if not math.isnan(v)]
+            count = len(values)
+            if count == 0:
+                return self
+            mean = math.fsum(values) / count
+            m2 = math.fsum((v - mean) ** 2 for v in values)
+            batch_min, batch_max = min(values), max(values)
+        self._combine(count, mean, m2, batch_min, batch_max)
+        return self
+
+    def merge(self, other: 'MomentsSketch') -> 'MomentsSketch':
+        self._check_type(other)
+        if other.count > 0:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        return self
+
+    def _combine(self, count: int, mean: float, m2: float, batch_min: float, batch_max: float) -> None:
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, batch_min)
+        self.max = max(self.max, batch_max)
+
+    def copy(self) -> 'MomentsSketch':
+        sketch = MomentsSketch()
+        sketch.count, sketch.mean, sketch.m2, sketch.min, sketch.max = \
+            self.count, self.mean, self.m2, self.min, self.max
+        return sketch
+
+
+class HistogramSketch(Sketch):
+    """
+    Histogram with fixed bin edges (agreed upon by all analyzers beforehand). Values outside the bins are counted as
+    underflow/overflow, NaN values as missing.
+    """
+    def __init__(self, edges: Iterable[float]) -> None:
+        self.edges = [float(e) for e in edges]
+        if (len(self.edges) < 2) or any(a >= b for a, b in zip(self.edges, self.edges[1:])):
+            raise ValueError(f"Histogram edges must be strictly increasing with at least two edges "
+                             f"(given: {self.edges}).")
+        self.counts = [0] * (len(self.edges) - 1)
+        self.underflow = 0
+        self.overflow = 0
+        self.missing = 0
+
+    def update(self, values: Iterable[Any]) -> 'HistogramSketch':
+        values = _as_values(values)
+        if np is not None:
+            nan_mask = np.isnan(values)
+            self.missing += int(nan_mask.sum())
+            values = values[~nan_mask]
+            self.underflow += int((values < self.edges[0]).sum())
+            self.overflow += int((values > self.edges[-1]).sum())
+            counts, _ = np.histogram(values, bins=self.edges)
+            self.counts = [c + int(n) for c, n in zip(self.counts, counts)]
+        else:
+            for v in values:
+                if math.isnan(v):
+                    self.missing += 1
+                elif v < self.edges[0]:
+                    self.underflow += 1
+                elif v > self.edges[-1]:
+                    self.overflow += 1
+                else:
+                    # last bin is closed (as in numpy.histogram)
+                    self.counts[min(bisect.bisect_right(self.edges, v) - 1, len(self.counts) - 1)] += 1
+        return self
+
+    def merge(self, other: 'HistogramSketch') -> 'HistogramSketch':
+        self._check_type(other)
+        if other.edges != self.edges:
+            raise ValueError("Unable to merge histograms with different bin edges.")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        self.missing += other.missing
+        return self
+
+    def copy(self) -> 'HistogramSketch':
+        sketch = HistogramSketch(self.edges)
+        sketch.counts = list(self.counts)
+        sketch.underflow, sketch.overflow, sketch.missing = self.underflow, self.overflow, self.missing
+        return sketch
+
+
+class CategoricalSketch(Sketch):
+    """
+    Counts of categorical values (e.g. value_counts of a column, or missing values per column).
+    """
+    def __init__(self, counts: Optional[dict[Any, int]] = None) -> None:
+        self.counts: dict[Any, int] = dict(counts) if counts is not None else {}
+
+    def update(self, values: Union[Iterable[Any], dict[Any, int]]) -> 'CategoricalSketch':
+        """
+        Add values, or counts given as dictionary {value: count} (e.g. from pandas' value_counts().to_dict()).
+        :return: self
+        """
+        if isinstance(values, dict):
+            for k, n in values.items():
+                self.counts[k] = self.counts.get(k, 0) + int(n)
+        else:
+            for v in values:
+                self.counts[v] = self.counts.get(v, 0) + 1
+        return self
+
+    def merge(self, other: 'CategoricalSketch') -> 'CategoricalSketch':
+        self._check_type(other)
+        return self.update(other.counts)
+
+    def most_common(self, n: Optional[int] = None) -> list[tuple[Any, int]]:
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return ranked if n is None else ranked[:n]
+
+    def copy(self) -> 'CategoricalSketch':
+        return CategoricalSketch(self.counts)
+
+
+class QuantileSketch(Sketch):
+    """
+    KLL sketch (Karnin, Lang, Liberty) approximating quantiles of numeric values (NaN values are ignored) in
+    O(k log(n/k)) memory. The rank error is about 1.65/k (with high probability, e.g. ~0.8% for k=200), both for
+    local sketches and merged ones. Merging requires the same k.
+    """
+    def __init__(self, k: int = 200, seed: Optional[int] = None) -> None:
+        if k < 8:
+            raise ValueError(f"k must be at least 8 (given: {k}).")
+        self.k = k
+        self.count = 0
+        self.compactors: list[list[float]] = [[]]  # items at level h carry weight 2^h
+        self._random = random.Random(seed)
+
+    def update(self, values: Iterable[Any]) -> 'QuantileSketch':
+        values = _as_values(values)
+        if np is not None:
+            values = values[~np.isnan(values)].tolist()
+        else:
+            values = [v for v in values if not math.isnan(v)]
+        self.count += len(values)
+        self.compactors[0].extend(values)
+        self._compress()
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        self._check_type(other)
+        if other.k != self.k:
+            raise ValueError(f"Unable to merge quantile sketches with different k ({self.k} and {other.k}).")
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.count += other.count
+        self._compress()
+        return self
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append([])
+                items.sort()
+                # keep a single item, if the number of items is odd, and promote every other of the rest
+                leftover = [items.pop()] if len(items) % 2 else []
+                offset = self._random.randint(0, 1)
+                self.compactors[level + 1].extend(items[offset::2])
+                self.compactors[level] = leftover
+                level = 0  # capacities shrink as the sketch grows, start over from the lowest level
+            else:
+                level += 1
+
+    def quantile(self, q: Union[float, Iterable[float]]) -> Union[float, list[float]]:
+        """
+        Approximate quantile(s) q (between 0 and 1), NaN if no values were added.
+        :return: quantile(s)
+        """
+        qs = [q] if isinstance(q, (int, float)) else list(q)
+        if any(not (0 <= p <= 1) for p in qs):
+            raise ValueError(f"Quantiles must be between 0 and 1 (given: {qs}).")
+        weighted = sorted((v, 2 ** level) for level, items in enumerate(self.compactors) for v in items)
+        if not weighted:
+            quantiles = [math.nan] * len(qs)
+        else:
+            cumulative = []
+            total = 0
+            for _, weight in weighted:
+                total += weight
+                cumulative.append(total)
+            quantiles = [weighted[min(bisect.bisect_left(cumulative, p * total), len(weighted) - 1)][0] for p in qs]
+        return quantiles[0] if isinstance(q, (int, float)) else quantiles
+
+    def copy(self) -> 'QuantileSketch':
+        sketch = QuantileSketch(self.k)
+        sketch.count = self.count
+        sketch.compactors = [list(items) for items in self.compactors]
+        sketch._random.setstate(self._random.getstate())
+        return sketch
@@ -0,0 +1,59 @@
+import asyncio
+from typing import Any, Optional
+from flame.star import StarModel, StarModelTester, StarAnalyzer, StarAggregator, AsyncStarModel
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    async def analysis_method(self, data, aggregator_results):
+        await asyncio.sleep(0.1)  # e.g. awaiting a request of the asynchronous data client
+        self.flame.flame_log(f"\tAggregator results in MyAnalyzer: {aggregator_results}", log_type='debug')
+        analysis_result = sum(data) / len(data) \
+            if aggregator_results is None \
+            else (sum(data) / len(data) + aggregator_results) + 1 / 2
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MySyncAnalyzer(MyAnalyzer):
+    def analysis_method(self, data, aggregator_results):
+        # Same analysis as a synchronous hook, as run by the StarModel
+        return asyncio.run(super().analysis_method(data, aggregator_results))
+
+
+class MyAggregator(StarAggregator):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        self.flame.flame_log(f"\tAnalysis results in MyAggregator: {analysis_results}", log_type='notice')
+        result = sum(analysis_results) / len(analysis_results)
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result}", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        self.flame.flame_log(f"\tLast result: {last_result}, Current result: {result}", log_type="notice")
+        self.flame.flame_log(f"\tChecking convergence at iteration {self.num_iterations}", log_type="notice")
+        return self.num_iterations >= 5  # Limit to 5 iterations for testing
+
+
+if __name__ == "__main__":
+    data_1 = [1, 2, 3, 4]
+    data_2 = [5, 6, 7, 8]
+    data_splits = [data_1, data_2]
+
+    results = {}
+    for model_class, analyzer in [(AsyncStarModel, MyAnalyzer), (StarModel, MySyncAnalyzer)]:
+        tester = StarModelTester(data_splits=data_splits,            # TODO: Insert your data fragments in a list
+                                 analyzer=analyzer,                  # TODO: Replace with your custom Analyzer class
+                                 aggregator=MyAggregator,            # TODO: Replace with your custom Aggregator class
+                                 data_type='s3',                     # TODO: Specify data type ('fhir' or 's3')
+                                 simple_analysis=False,
+                                 model_class=model_class)            # Run every node on an asyncio event loop
+        assert not tester.errors, (model_class.__name__, tester.errors)
+        results[model_class.__name__] = tester.result
+
+    # Nodes running on event loops compute the same result as the StarModel
+    assert results['AsyncStarModel'] == results['StarModel'], results
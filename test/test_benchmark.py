@@ -0,0 +1,45 @@
+from typing import Any, Optional
+from flame.star import StarModelTester
+from flame.star.star_benchmark import BenchmarkAggregator, BenchmarkAnalyzer, main, run_benchmark
+from flame.utils.phase_timer import payload_size
+
+
+RECEIVED = []  # aggregated results received by the analyzers
+
+
+class RecordingBenchmarkAnalyzer(BenchmarkAnalyzer):
+    def analysis_method(self, data: Any, aggregator_results: Optional[Any]) -> Any:
+        if aggregator_results is not None:
+            RECEIVED.append(aggregator_results)
+        return super().analysis_method(data, aggregator_results)
+
+
+if __name__ == "__main__":
+    # Same as: python -m flame.star.star_benchmark --nodes 2 8 --payload-sizes 1KB 1MB --iterations 3
+    main(['--nodes', '2', '8',
+          '--payload-sizes', '1KB', '1MB',
+          '--iterations', '3'])
+
+    # The benchmark runs exactly the given number of rounds, and only the final result holds the recorded times
+    tester = StarModelTester(data_splits=[[{'benchmark': b''}] for _ in range(4)],
+                             analyzer=RecordingBenchmarkAnalyzer,
+                             aggregator=BenchmarkAggregator,
+                             data_type='s3',
+                             simple_analysis=False,
+                             output_type='pickle',
+                             analyzer_kwargs={'payload_size': 1024},
+                             aggregator_kwargs={'iterations': 3},
+                             quiet=True)
+    assert not tester.errors, tester.errors
+    round_times = tester.result['round_times']
+    assert len(round_times) == 3 and round_times == sorted(round_times), round_times
+    assert len(RECEIVED) == 4 * 2 and all(result == bytes(1024) for result in RECEIVED), RECEIVED
+
+    # Payloads, which are not encoded to a single buffer (here lists of 300k floats), are not walked to record their
+    # sizes (which would slow down every send), unless timings are logged
+    assert payload_size([0.0] * 1000) is None
+    assert payload_size([0.0] * 1000, deep=True) > 0
+    measurements = run_benchmark(num_nodes=8, payload_size=300_000 * 9, iterations=3, payload_type='list',
+                                 measure_memory=False)
+    assert (measurements['iterations'], measurements['payload_type']) == (3, 'list'), measurements
+    print(f"List payloads: {measurements['round_ms_mean']:.1f} ms per round")
@@ -0,0 +1,60 @@
+import time
+from typing import Any, Optional
+from flame.star import StarModelTester, StarAnalyzer, StarAggregator
+
+
+UPDATES = []  # (time, contributors) of every update of the aggregator
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        if 9 in data:
+            time.sleep(0.3)  # Simulate a slow node, the others continue without waiting for it
+        analysis_result = sum(data) / len(data) \
+            if aggregator_results is None \
+            else (sum(data) / len(data) + aggregator_results) / 2
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MyAggregator(StarAggregator):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        # Only results arrived since the last update are given, blend them into the latest aggregated result
+        self.flame.flame_log(f"\tUpdating with results of {self.contributor_ids}", log_type='notice')
+        UPDATES.append((time.monotonic(), list(self.contributor_ids)))
+        update = sum(analysis_results) / len(analysis_results)
+        result = update if self.latest_result is None else (self.latest_result + update) / 2
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result}", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        return self.num_iterations >= 12  # Limit to 12 updates for testing
+
+
+if __name__ == "__main__":
+    data_1 = [1, 2, 3, 4]
+    data_2 = [5, 6, 7, 8]
+    data_3 = [9, 10, 11, 12]
+    data_splits = [data_1, data_2, data_3]
+
+    tester = StarModelTester(data_splits=data_splits,                # TODO: Insert your data fragments in a list
+                             analyzer=MyAnalyzer,                    # TODO: Replace with your custom Analyzer class
+                             aggregator=MyAggregator,                # TODO: Replace with your custom Aggregator class
+                             data_type='s3',                         # TODO: Specify data type ('fhir' or 's3')
+                             simple_analysis=False,
+                             model_kwargs={'max_staleness': 4})      # Update on every arriving result, drop results
+                                                                     # based on results more than 4 updates old
+
+    # Every update is made at the next check for arrived results, without waiting for the slow analyzer
+    assert not tester.errors, tester.errors
+    assert len(UPDATES) >= 12, len(UPDATES)
+    assert all(contributors for _, contributors in UPDATES)
+    assert any(len(contributors) < len(data_splits) for _, contributors in UPDATES)
+    update_gaps = [later - earlier for (earlier, _), (later, _) in zip(UPDATES, UPDATES[1:])]
+    assert max(update_gaps) < 0.5, f"Updates delayed by {max(update_gaps):.3f}s"
@@ -0,0 +1,76 @@
+import collections
+import time
+from typing import Any, Optional
+from flame.star import AsyncStarModel, StarModel, StarModelTester, StarAnalyzer, StarAggregator
+from flame.utils.codec import PayloadCache, PickleCodec
+
+
+ENCODED = collections.Counter()  # number of encodings per aggregated result (by iteration)
+
+
+class CountingCodec(PickleCodec):
+    def encode(self, data: Any) -> bytes:
+        if isinstance(data, dict):
+            ENCODED[data['iteration']] += 1
+        return super().encode(data)
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        time.sleep(0.15 if 9 in data else 0.05)  # Simulate a slow node, whose results are stale on arrival
+        analysis_result = sum(data) / len(data) \
+            if aggregator_results is None \
+            else (sum(data) / len(data) + aggregator_results['mean']) / 2
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MyAggregator(StarAggregator):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        result = {'iteration': self.num_iterations, 'mean': sum(analysis_results) / len(analysis_results)}
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result}", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        return self.num_iterations >= 8  # Limit to 8 iterations for testing
+
+
+if __name__ == "__main__":
+    # Broadcasting the same object again within a round (e.g. the latest aggregated result resent to analyzers of
+    # stale results) reuses its buffer, the next round encodes it anew
+    cache, result = PayloadCache(), {'iteration': 0, 'mean': 1.0}
+    payload = cache.get(result, 0, CountingCodec().encode)
+    assert cache.get(result, 0, CountingCodec().encode) is payload
+    assert cache.get(dict(result), 0, CountingCodec().encode) is not payload
+    cache.get(result, 1, CountingCodec().encode)
+    assert (cache.hits, cache.misses, ENCODED[0]) == (1, 3, 3), (cache.hits, cache.misses, ENCODED)
+
+    data_1 = [1, 2, 3, 4]
+    data_2 = [5, 6, 7, 8]
+    data_3 = [9, 10, 11, 12]
+    data_splits = [data_1, data_2, data_3]
+
+    for model_class, model_kwargs in [(StarModel, {'broadcast_workers': 3, 'send_attempts': 8}),
+                                      (StarModel, {'send_attempts': 8}),
+                                      (AsyncStarModel, {'send_attempts': 8}),
+                                      (StarModel, {'max_staleness': 0, 'send_attempts': 8})]:
+        ENCODED.clear()
+        tester = StarModelTester(data_splits=data_splits,            # TODO: Insert your data fragments in a list
+                                 analyzer=MyAnalyzer,                # TODO: Replace with your custom Analyzer class
+                                 aggregator=MyAggregator,            # TODO: Replace with your custom Aggregator class
+                                 data_type='s3',                     # TODO: Specify data type ('fhir' or 's3')
+                                 simple_analysis=False,
+                                 model_kwargs={'codec': CountingCodec(), **model_kwargs},
+                                 mock_kwargs={'send_failure_rate': 0.2},  # Simulated probability of failed sends
+                                 model_class=model_class)
+
+        # Every aggregated result but the final one was broadcast, and encoded only once regardless of its number of
+        # receivers and resends
+        assert not tester.errors, tester.errors
+        assert ENCODED == collections.Counter({iteration: 1 for iteration in range(8)}), (model_kwargs, ENCODED)
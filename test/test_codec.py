@@ -0,0 +1,85 @@
+from typing import Any, Optional
+import numpy as np
+from flame.star import StarModelTester, StarAnalyzer, StarAggregator
+from flame.utils.codec import NumpyCodec
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        # Ship the mean as a 0-d array, and the values as a float64 array
+        values = np.asarray(data, dtype=np.float64)
+        weights = values if aggregator_results is None else (values + aggregator_results['weights'].mean()) / 2
+        analysis_result = {'mean': np.array(weights.mean()), 'weights': weights}
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MyAggregator(StarAggregator):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        assert all(result['mean'].shape == () for result in analysis_results), analysis_results
+        result = {'weights': np.concatenate([result['weights'] for result in analysis_results])}
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result}", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        return self.num_iterations >= 2  # Limit to 2 iterations for testing
+
+
+def assert_round_trip(codec: NumpyCodec, array: np.ndarray) -> None:
+    payload = codec.encode({'array': array, 'arrays': [array, (array,)]})
+    decoded = codec.decode(payload)
+    for decoded_array in [decoded['array'], decoded['arrays'][0], decoded['arrays'][1][0]]:
+        assert decoded_array.shape == array.shape, (decoded_array.shape, array.shape)
+        assert decoded_array.dtype == array.dtype.newbyteorder('<'), (decoded_array.dtype, array.dtype)
+        assert np.array_equal(decoded_array, array), (decoded_array, array)
+        assert decoded_array.flags.aligned
+        if codec.compression is None:
+            # array buffers start at 64-byte offsets from the start of the payload (zero-copy views on it)
+            assert not decoded_array.flags.writeable
+            payload_address = np.frombuffer(payload, dtype=np.uint8).ctypes.data
+            assert (decoded_array.ctypes.data - payload_address) % 64 == 0
+
+
+if __name__ == "__main__":
+    arrays = [np.array(3.5),                                               # 0-d
+              np.array(7, dtype=np.int32),                                 # 0-d
+              np.empty((0,), dtype=np.float64),                            # empty
+              np.empty((3, 0), dtype=np.int16),                            # empty
+              np.arange(10, dtype='>f8'),                                  # big-endian
+              np.arange(12, dtype='>i4').reshape(3, 4),                    # big-endian
+              np.arange(24, dtype=np.float64).reshape(4, 6)[::2, 1::2],    # non-contiguous
+              np.asfortranarray(np.arange(6, dtype=np.float32).reshape(2, 3)),  # non-contiguous (Fortran order)
+              np.arange(5, dtype=np.uint8),                                # odd sizes before the next array
+              np.array([True, False])]
+    for codec in [NumpyCodec(), NumpyCodec(compression='zlib'), NumpyCodec(compression='lzma')]:
+        for array in arrays:
+            assert_round_trip(codec, array)
+        # several arrays of different sizes in one payload, each aligned
+        assert_round_trip(codec, np.arange(3, dtype=np.uint8))
+        decoded = codec.decode(codec.encode(arrays))
+        assert all(np.array_equal(a, b) and a.shape == b.shape for a, b in zip(decoded, arrays))
+    try:
+        NumpyCodec().decode(b'not a NumpyCodec payload')
+        raise AssertionError("Decoding a foreign payload did not fail")
+    except ValueError:
+        pass
+
+    data_1 = [1, 2, 3, 4]
+    data_2 = [5, 6, 7, 8]
+    data_splits = [data_1, data_2]
+
+    tester = StarModelTester(data_splits=data_splits,                # TODO: Insert your data fragments in a list
+                             analyzer=MyAnalyzer,                    # TODO: Replace with your custom Analyzer class
+                             aggregator=MyAggregator,                # TODO: Replace with your custom Aggregator class
+                             data_type='s3',                         # TODO: Specify data type ('fhir' or 's3')
+                             simple_analysis=False,
+                             model_kwargs={'codec': NumpyCodec()})   # Ship numpy arrays as raw buffers
+
+    assert not tester.errors, tester.errors
+    assert tester.result['weights'].shape == (8,), tester.result
@@ -0,0 +1,66 @@
+import threading
+from typing import Any, Optional
+from flame.star import StarModelTester, StarAnalyzer, StarAggregator
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        analysis_result = sum(data) / len(data) \
+            if aggregator_results is None \
+            else (sum(data) / len(data) + aggregator_results) + 1 / 2
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MyAggregator(StarAggregator):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        result = sum(analysis_results) / len(analysis_results)
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result}", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        return self.num_iterations >= 3  # Limit to 3 iterations for testing
+
+
+if __name__ == "__main__":
+    # Every simulation owns its own message broker, logs and counters, such that several can run at the same time
+    # (e.g. for parameter sweeps)
+    simulations = [[[1, 2, 3, 4], [5, 6, 7, 8]],
+                   [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12]],
+                   [[i, i + 1] for i in range(0, 16, 2)]]
+
+    testers = {}
+
+    def run_simulation(index: int, data_splits: list[list[int]]) -> None:
+        testers[index] = StarModelTester(data_splits=data_splits,     # TODO: Insert your data fragments in a list
+                                         analyzer=MyAnalyzer,         # TODO: Replace with your custom Analyzer class
+                                         aggregator=MyAggregator,     # TODO: Replace with your custom Aggregator class
+                                         data_type='s3',              # TODO: Specify data type ('fhir' or 's3')
+                                         simple_analysis=False)
+
+    threads = [threading.Thread(target=run_simulation, args=(index, data_splits))
+               for index, data_splits in enumerate(simulations)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Every simulation returned its own result, as if it had been run on its own
+    assert sorted(testers.keys()) == list(range(len(simulations))), testers
+    assert all(not tester.errors for tester in testers.values()), [tester.errors for tester in testers.values()]
+    results = [testers[index].result for index in range(len(simulations))]
+    assert len(set(results)) == len(simulations), results
+    for index, data_splits in enumerate(simulations):
+        reference = StarModelTester(data_splits=data_splits,
+                                    analyzer=MyAnalyzer,
+                                    aggregator=MyAggregator,
+                                    data_type='s3',
+                                    simple_analysis=False,
+                                    quiet=True)
+        assert results[index] == reference.result, (index, results[index], reference.result)
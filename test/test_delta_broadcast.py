@@ -0,0 +1,95 @@
+import copy
+import time
+from typing import Any, Optional
+from flame.star import StarModel, StarModelTester, StarAnalyzer, StarAggregator
+
+
+AGGREGATED = {}  # aggregated result per iteration, as computed by the aggregator
+RECEIVED = []  # (analyzer, iteration, reconstructed exactly) of every aggregated result received by an analyzer
+BROADCASTS = []  # (iteration, receivers, full payload) of every payload broadcast by the aggregator
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        if aggregator_results is not None:
+            # the aggregated result is reconstructed from the changes since the previously received one
+            RECEIVED.append((self.id,
+                             aggregator_results['iteration'],
+                             aggregator_results == AGGREGATED[aggregator_results['iteration']]))
+        time.sleep(0.25 if 9 in data else 0.1)  # Simulate a straggling node, which misses rounds in quorum mode
+        analysis_result = sum(data) / len(data) \
+            if aggregator_results is None \
+            else sum(data) / len(data) + sum(aggregator_results['weights']) / 100
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MyAggregator(StarAggregator):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        # Only a single weight changes per iteration, such that changes are sent instead of the full result
+        weights = list(self.latest_result['weights']) if self.latest_result is not None else [0.0] * 8
+        weights[self.num_iterations % len(weights)] = sum(analysis_results) / len(analysis_results)
+        result = {'iteration': self.num_iterations, 'weights': weights, 'contributors': len(analysis_results)}
+        AGGREGATED[self.num_iterations] = copy.deepcopy(result)
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result}", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        return self.num_iterations >= 6  # Limit to 6 iterations for testing
+
+
+class RecordingStarModel(StarModel):
+    def _broadcast_payloads(self, aggregator, analyzers, agg_res):
+        broadcasts = super()._broadcast_payloads(aggregator, analyzers, agg_res)
+        for receivers, payload in broadcasts:
+            _, encoded = self._unpack(payload)
+            full = self._broadcast_codec.decode(encoded)['base'] is None
+            BROADCASTS.append((agg_res['iteration'], list(receivers), full))
+        return broadcasts
+
+
+if __name__ == "__main__":
+    data_1 = [1, 2, 3, 4]
+    data_2 = [5, 6, 7, 8]
+    data_3 = [9, 10, 11, 12]
+    data_splits = [data_1, data_2, data_3]
+
+    for model_kwargs in [{'delta_broadcast': True},
+                         {'delta_broadcast': True, 'quorum': 2, 'late_results': 'next_round'}]:
+        AGGREGATED.clear()
+        RECEIVED.clear()
+        BROADCASTS.clear()
+        tester = StarModelTester(data_splits=data_splits,            # TODO: Insert your data fragments in a list
+                                 analyzer=MyAnalyzer,                # TODO: Replace with your custom Analyzer class
+                                 aggregator=MyAggregator,            # TODO: Replace with your custom Aggregator class
+                                 data_type='s3',                     # TODO: Specify data type ('fhir' or 's3')
+                                 simple_analysis=False,
+                                 model_kwargs=model_kwargs,          # Broadcast changes of the aggregated result only
+                                 model_class=RecordingStarModel)
+
+        # Every analyzer reconstructed exactly the aggregated result computed by the aggregator
+        assert not tester.errors, tester.errors
+        assert RECEIVED and all(exact for _, _, exact in RECEIVED), RECEIVED
+        broadcast_iterations = sorted({iteration for iteration, _, _ in BROADCASTS})
+        assert broadcast_iterations == sorted(AGGREGATED.keys())[:-1], (broadcast_iterations, AGGREGATED.keys())
+        first_iteration = broadcast_iterations[0]
+        assert all(full for iteration, _, full in BROADCASTS if iteration == first_iteration), BROADCASTS
+        later_broadcasts = [(receivers, full) for iteration, receivers, full in BROADCASTS
+                            if iteration != first_iteration]
+        assert any(not full for _, full in later_broadcasts), BROADCASTS
+
+        if 'quorum' not in model_kwargs:
+            # all analyzers hold every aggregated result, only changes are sent after the first broadcast
+            assert not any(full for _, full in later_broadcasts), BROADCASTS
+            assert len(RECEIVED) == len(data_splits) * len(broadcast_iterations), RECEIVED
+        else:
+            # the straggler missed rounds, its version did not match and it was sent the full result instead
+            fallbacks = {(iteration, receiver) for iteration, receivers, full in BROADCASTS
+                         if full and (iteration != first_iteration) for receiver in receivers}
+            assert fallbacks & {(iteration, analyzer) for analyzer, iteration, _ in RECEIVED}, (BROADCASTS, RECEIVED)
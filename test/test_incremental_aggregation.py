@@ -0,0 +1,72 @@
+import time
+from typing import Any, Optional
+from flame.star import StarModelTester, StarAnalyzer, StarAggregator
+
+
+ACCUMULATIONS = []  # (round, time) of every accumulated analysis result
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        self.flame.flame_log(f"\tAggregator results in MyAnalyzer: {aggregator_results}", log_type='debug')
+        if 5 in data:
+            time.sleep(0.5)  # Simulate a slow node, the result of the other node is accumulated in the meantime
+        analysis_result = sum(data) / len(data) \
+            if aggregator_results is None \
+            else (sum(data) / len(data) + aggregator_results) + 1 / 2
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MyAggregator(StarAggregator):
+    incremental_aggregation = True  # Results are folded into a running (sum, count) pair as they arrive
+
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def init_aggregation(self) -> Any:
+        return 0.0, 0
+
+    def accumulate(self, partial_result: Any, analysis_result: Any) -> Any:
+        self.flame.flame_log(f"\tAccumulating analysis result in MyAggregator: {analysis_result}", log_type='notice')
+        ACCUMULATIONS.append((self.num_iterations, time.monotonic()))
+        total, count = partial_result
+        return total + analysis_result, count + 1
+
+    def finalize_aggregation(self, partial_result: Any) -> Any:
+        total, count = partial_result
+        result = total / count
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result}", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        self.flame.flame_log(f"\tLast result: {last_result}, Current result: {result}", log_type="notice")
+        self.flame.flame_log(f"\tChecking convergence at iteration {self.num_iterations}", log_type="notice")
+        return self.num_iterations >= 5  # Limit to 5 iterations for testing
+
+
+if __name__ == "__main__":
+    data_1 = [1, 2, 3, 4]
+    data_2 = [5, 6, 7, 8]
+    data_splits = [data_1, data_2]
+
+    tester = StarModelTester(data_splits=data_splits,                # TODO: Insert your data fragments in a list
+                             analyzer=MyAnalyzer,                    # TODO: Replace with your custom Analyzer class
+                             aggregator=MyAggregator,                # TODO: Replace with your custom Aggregator class
+                             data_type='s3',                         # TODO: Specify data type ('fhir' or 's3')
+                             simple_analysis=False)
+
+    # Every round accumulates one result per analyzer, the fast one at the next check after it arrived, before the
+    # slow one
+    assert not tester.errors, tester.errors
+    assert tester.result == 29.5, tester.result
+    rounds = sorted({num_round for num_round, _ in ACCUMULATIONS})
+    assert rounds == list(range(6)), rounds
+    for num_round in rounds:
+        times = [t for r, t in ACCUMULATIONS if r == num_round]
+        assert len(times) == len(data_splits), (num_round, times)
+        assert times[1] - times[0] > 0.3, f"Results of round {num_round} were accumulated together"
+
@@ -0,0 +1,99 @@
+from typing import Any, Optional
+from flame.star import StarModelTester, StarAnalyzer, StarAggregator
+from flame.utils.lazy_data import LazyNodeData
+
+
+RESIDENT_DATASETS = []  # number of datasets held by the lazy data of an analyzer after every streamed dataset
+DATASOURCES = []  # datasources of an analyzer as dictionaries, converted from their lazy views
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        # Stream through the datasets one key at a time, without keeping them in memory (lazy_data_cache=False)
+        assert isinstance(data, LazyNodeData), type(data)
+        total, count = 0, 0
+        for _, key, dataset in data.iter_datasets():
+            values = [int(value) for value in bytes(dataset).decode('utf-8').split()]
+            total, count = total + sum(values), count + len(values)
+            RESIDENT_DATASETS.append(len(data._loaded))
+        analysis_result = total / count \
+            if aggregator_results is None \
+            else (total / count + aggregator_results) / 2
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MyMappingAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        # Datasources hold different keys, their lazy views only list the keys they hold
+        assert isinstance(data, LazyNodeData), type(data)
+        datasources = [dict(datasource) for datasource in data]
+        for datasource, view in zip(datasources, data):
+            assert len(view) == len(datasource), (view, datasource)
+            assert list(view.items()) == list(datasource.items()), (view, datasource)
+            assert all(key in view for key in datasource) and 'unused.txt' not in view, (view, datasource)
+        DATASOURCES.append(datasources)
+        values = [int(value) for datasource in datasources for dataset in datasource.values()
+                  for value in bytes(dataset).decode('utf-8').split()]
+        analysis_result = sum(values) / len(values)
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MyAggregator(StarAggregator):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        result = sum(analysis_results) / len(analysis_results)
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result}", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        return self.num_iterations >= 2  # Limit to 2 iterations for testing
+
+
+if __name__ == "__main__":
+    data_1 = [{'a.txt': b'1 2', 'b.txt': b'3 4', 'unused.txt': b'100'}]
+    data_2 = [{'a.txt': b'5 6', 'b.txt': b'7 8', 'unused.txt': b'100'}]
+    data_splits = [data_1, data_2]
+
+    tester = StarModelTester(data_splits=data_splits,                # TODO: Insert your data fragments in a list
+                             analyzer=MyAnalyzer,                    # TODO: Replace with your custom Analyzer class
+                             aggregator=MyAggregator,                # TODO: Replace with your custom Aggregator class
+                             data_type='s3',                         # TODO: Specify data type ('fhir' or 's3')
+                             query=['a.txt', 'b.txt'],               # TODO: Specify the s3 keys to be streamed
+                             simple_analysis=False,
+                             model_kwargs={'lazy_data': True,        # Retrieve datasets one key at a time ...
+                                           'lazy_data_cache': False})  # ... without keeping them in memory
+
+    # Every analyzer streamed both datasets in every iteration, and never held a retrieved dataset
+    assert not tester.errors, tester.errors
+    assert tester.result == 4.5, tester.result
+    assert len(RESIDENT_DATASETS) == 3 * 2 * len(data_splits), RESIDENT_DATASETS  # 3 iterations of 2 datasets
+    assert not any(RESIDENT_DATASETS), RESIDENT_DATASETS
+
+    data_1 = [{'a.txt': b'1 2', 'b.txt': b'3 4'}, {'a.txt': b'5 6'}]
+    data_2 = [{'b.txt': b'7 8'}, {'a.txt': b'9 10', 'unused.txt': b'100'}]
+    data_splits = [data_1, data_2]
+    for cache in [True, False]:
+        DATASOURCES.clear()
+        tester = StarModelTester(data_splits=data_splits,            # TODO: Insert your data fragments in a list
+                                 analyzer=MyMappingAnalyzer,         # TODO: Replace with your custom Analyzer class
+                                 aggregator=MyAggregator,            # TODO: Replace with your custom Aggregator class
+                                 data_type='s3',                     # TODO: Specify data type ('fhir' or 's3')
+                                 query=['a.txt', 'b.txt'],           # TODO: Specify the s3 keys to be retrieved
+                                 simple_analysis=False,
+                                 model_kwargs={'lazy_data': True, 'lazy_data_cache': cache})
+
+        # Every datasource converted to the queried datasets it holds, with and without caching
+        expected = [[{'a.txt': b'1 2', 'b.txt': b'3 4'}, {'a.txt': b'5 6'}], [{'b.txt': b'7 8'}, {'a.txt': b'9 10'}]]
+        assert not tester.errors, tester.errors
+        assert len(DATASOURCES) == 3 * len(data_splits), DATASOURCES  # 3 iterations
+        assert all(datasources in expected for datasources in DATASOURCES), DATASOURCES
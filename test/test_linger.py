@@ -0,0 +1,29 @@
+import os
+import signal
+import threading
+import time
+from flame.star import StarModel
+
+
+def linger(linger_timeout=None, signum=None) -> tuple[float, float]:
+    # Linger in the main thread (optionally sending the given signal after 0.2s), recording wall-clock and CPU time
+    if signum is not None:
+        threading.Timer(0.2, os.kill, args=(os.getpid(), signum)).start()
+    start, start_cpu = time.perf_counter(), time.process_time()
+    StarModel._linger(linger_timeout)
+    return time.perf_counter() - start, time.process_time() - start_cpu
+
+
+if __name__ == "__main__":
+    # Nodes linger until the linger timeout expires, without consuming CPU
+    seconds, cpu_seconds = linger(linger_timeout=0.5)
+    assert 0.5 <= seconds < 0.7, seconds
+    assert cpu_seconds < 0.1, cpu_seconds
+
+    # Nodes without a linger timeout linger until they are shut down by SIGTERM or SIGINT, also before the timeout
+    for signum in [signal.SIGTERM, signal.SIGINT]:
+        seconds, cpu_seconds = linger(signum=signum)
+        assert 0.2 <= seconds < 0.4, (signum, seconds)
+        assert cpu_seconds < 0.1, (signum, cpu_seconds)
+        seconds, _ = linger(linger_timeout=5, signum=signum)
+        assert 0.2 <= seconds < 0.4, (signum, seconds)
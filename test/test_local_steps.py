@@ -0,0 +1,62 @@
+from typing import Any, Optional
+from flame.star import StarModelTester, StarAnalyzer, StarAggregator
+
+
+CALLS = []  # (analyzer, round, local step) of every call of analysis_method
+
+class MyAnalyzer(StarAnalyzer):
+    local_steps = 2  # Run two local updates per round by default
+
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def schedule_local_steps(self, num_iterations: int) -> int:
+        # Run more local updates in later rounds, as the model gets closer to convergence
+        return self.local_steps * (num_iterations + 1)
+
+    def analysis_method(self, data, aggregator_results):
+        CALLS.append((self.id, self.num_iterations, self.local_step))
+        # Gradient step towards the local mean, starting from the aggregated model (or the previous local step)
+        model = 0.0 if aggregator_results is None else aggregator_results
+        analysis_result = model + 0.5 * (sum(data) / len(data) - model)
+        self.flame.flame_log(f"MyAnalysis result ({self.id}, local step {self.local_step}): {analysis_result}",
+                             log_type='debug')
+        return analysis_result
+
+
+class MyAggregator(StarAggregator):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        self.flame.flame_log(f"\tAnalysis results in MyAggregator: {analysis_results}", log_type='notice')
+        result = sum(analysis_results) / len(analysis_results)
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result}", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        self.flame.flame_log(f"\tChecking convergence at iteration {self.num_iterations}", log_type="notice")
+        return (last_result is not None) and (abs(result - last_result) < 1e-3)
+
+
+if __name__ == "__main__":
+    data_1 = [1, 2, 3, 4]
+    data_2 = [5, 6, 7, 8]
+    data_splits = [data_1, data_2]
+
+    tester = StarModelTester(data_splits=data_splits,                # TODO: Insert your data fragments in a list
+                             analyzer=MyAnalyzer,                    # TODO: Replace with your custom Analyzer class
+                             aggregator=MyAggregator,                # TODO: Replace with your custom Aggregator class
+                             data_type='s3',                         # TODO: Specify data type ('fhir' or 's3')
+                             simple_analysis=False)
+
+    # Every analyzer ran the scheduled number of local steps (2, 4, 6, ...) in every round, one after another
+    assert not tester.errors, tester.errors
+    analyzers = sorted({analyzer for analyzer, _, _ in CALLS})
+    assert len(analyzers) == len(data_splits), analyzers
+    for analyzer in analyzers:
+        calls = [(num_round, step) for node, num_round, step in CALLS if node == analyzer]
+        num_rounds = calls[-1][0] + 1
+        assert num_rounds > 1, calls
+        assert calls == [(num_round, step) for num_round in range(num_rounds)
+                         for step in range(MyAnalyzer.local_steps * (num_round + 1))], calls
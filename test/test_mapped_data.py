@@ -0,0 +1,74 @@
+import csv
+import io
+from typing import Any, Optional
+from flame.star import StarModelTester, StarAnalyzer, StarAggregator
+from flame.utils.mapped_data import as_file, spill_to_mmap
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        # With mmap_s3_data, datasets are memory-mapped buffers, read them as files without copying them as a whole
+        values = []
+        for datasource in data:
+            for key, dataset in datasource.items():
+                assert isinstance(dataset, memoryview), type(dataset)
+                reader = csv.DictReader(io.TextIOWrapper(as_file(dataset), encoding='utf-8'))
+                values.extend(int(row['value']) for row in reader)
+        analysis_result = sum(values) / len(values)
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MyAggregator(StarAggregator):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        result = sum(analysis_results) / len(analysis_results)
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result}", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        return True
+
+
+def csv_dataset(values: list[int]) -> bytes:
+    return ('value\n' + ''.join(f"{value}\n" for value in values)).encode('utf-8')
+
+
+if __name__ == "__main__":
+    # Files over memory-mapped buffers behave like files over bytes, also at and past the end of the buffer
+    mapped = spill_to_mmap(b'0123456789')
+    f = as_file(mapped)
+    assert f.read(4) == b'0123'
+    assert f.read() == b'456789'
+    assert f.read() == b''
+    f.seek(100)
+    assert f.read() == b''
+    assert f.read(10) == b''
+    assert f.raw.readinto(bytearray(10)) == 0
+    f.seek(-3, io.SEEK_END)
+    assert f.read() == b'789'
+    try:
+        f.seek(-20, io.SEEK_END)
+        raise AssertionError("Seeking before the start of the buffer did not fail")
+    except ValueError:
+        pass
+    assert as_file(spill_to_mmap(b'')).read() == b''
+
+    data_1 = [{'values.csv': csv_dataset([1, 2, 3, 4])}]
+    data_2 = [{'values.csv': csv_dataset([5, 6, 7, 8])}, {'values.csv': csv_dataset([9, 10, 11, 12])}]
+    data_splits = [data_1, data_2]
+
+    tester = StarModelTester(data_splits=data_splits,                # TODO: Insert your data fragments in a list
+                             analyzer=MyAnalyzer,                    # TODO: Replace with your custom Analyzer class
+                             aggregator=MyAggregator,                # TODO: Replace with your custom Aggregator class
+                             data_type='s3',                         # TODO: Specify data type ('fhir' or 's3')
+                             simple_analysis=True,
+                             model_kwargs={'mmap_s3_data': True})    # Spill s3 datasets to memory-mapped files
+
+    assert not tester.errors, tester.errors
+    assert tester.result == 5.5, tester.result
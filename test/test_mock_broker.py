@@ -0,0 +1,88 @@
+import threading
+import time
+from flame.utils.mock_flame_core import MockMessageBroker, MockSimulation
+
+
+def wait_in_thread(broker: MockMessageBroker, node_id: str, senders: list[str], timeout=None) -> tuple:
+    # Wait for intermediate data of the given senders in a separate thread, recording its return value and duration
+    outcome = {}
+
+    def wait():
+        start = time.perf_counter()
+        outcome['finished'] = broker.wait(node_id, senders, 'intermediate_data', timeout=timeout)
+        outcome['seconds'] = time.perf_counter() - start
+
+    thread = threading.Thread(target=wait, daemon=True)
+    thread.start()
+    time.sleep(0.05)
+    return thread, outcome
+
+
+if __name__ == "__main__":
+    # A waiting node is only woken once all of its senders have delivered, and then without delay
+    broker = MockMessageBroker()
+    broker.register('aggregator')
+    thread, outcome = wait_in_thread(broker, 'aggregator', ['a', 'b'], timeout=5)
+    broker.deliver('aggregator', 'a', 'intermediate_data', 1)
+    time.sleep(0.2)
+    assert thread.is_alive(), outcome
+    delivered = time.perf_counter()
+    broker.deliver('aggregator', 'b', 'intermediate_data', 2)
+    thread.join(1)
+    assert not thread.is_alive() and (time.perf_counter() - delivered) < 0.1, outcome
+    assert outcome['finished'] is False, outcome
+    assert broker.collect('aggregator', ['a', 'b'], 'intermediate_data') == {'a': 1, 'b': 2}
+
+    # Without all senders, the wait ends with its timeout
+    thread, outcome = wait_in_thread(broker, 'aggregator', ['a'], timeout=0.3)
+    thread.join(1)
+    assert 0.3 <= outcome['seconds'] < 0.5 and outcome['finished'] is False, outcome
+
+    # The end of the analysis wakes a waiting node, which is told that the analysis is finished
+    thread, outcome = wait_in_thread(broker, 'aggregator', ['a'])
+    broker.deliver('aggregator', 'a', 'analysis_finished', None)
+    thread.join(1)
+    assert not thread.is_alive() and outcome['finished'] is True, outcome
+
+    # Stopping the simulation interrupts all waiting nodes, which no longer block afterwards
+    simulation = MockSimulation()
+    threads = [wait_in_thread(simulation.message_broker, node_id, ['aggregator']) for node_id in ['a', 'b']]
+    assert simulation.stop('a') and not simulation.stop('b'), simulation.stop_event
+    for thread, outcome in threads:
+        thread.join(1)
+        assert not thread.is_alive() and outcome['finished'] is False, outcome
+    assert simulation.stop_event == ['a'], simulation.stop_event
+    start = time.perf_counter()
+    simulation.message_broker.wait('a', ['aggregator'], 'intermediate_data')
+    assert time.perf_counter() - start < 0.1
+
+    # Mailboxes retain the latest message per category and sender, and collecting only removes the requested ones
+    broker = MockMessageBroker()
+    assert broker.deliver('aggregator', 'a', 'intermediate_data', 1) is None
+    assert broker.deliver('aggregator', 'a', 'intermediate_data', 2) == 1
+    broker.deliver('aggregator', 'a', 'other', 3)
+    broker.deliver('aggregator', 'b', 'intermediate_data', 4)
+    assert broker.collect('aggregator', ['a', 'c'], 'intermediate_data') == {'a': 2}
+    assert broker.collect('aggregator', ['a'], 'intermediate_data') == {}
+    assert sorted(broker.drain()) == [3, 4]
+
+    # Only senders without an available message are outstanding, and only their messages of the awaited category
+    # reduce the outstanding senders
+    broker.deliver('aggregator', 'a', 'intermediate_data', 5)
+    thread, outcome = wait_in_thread(broker, 'aggregator', ['a', 'b', 'c'], timeout=5)
+    mailbox = broker._get_mailbox('aggregator')
+    assert mailbox.outstanding_senders == {'b', 'c'}, mailbox.outstanding_senders
+    broker.deliver('aggregator', 'b', 'other', 6)
+    broker.deliver('aggregator', 'd', 'intermediate_data', 7)
+    broker.deliver('aggregator', 'b', 'intermediate_data', 8)
+    assert mailbox.outstanding_senders == {'c'}, mailbox.outstanding_senders
+    broker.deliver('aggregator', 'c', 'intermediate_data', 9)
+    thread.join(1)
+    assert not thread.is_alive() and not mailbox.outstanding_senders, outcome
+    assert broker.collect('aggregator', ['a', 'b', 'c'], 'intermediate_data') == {'a': 5, 'b': 8, 'c': 9}
+
+    # All awaited messages being available already, waiting returns immediately
+    broker.deliver('aggregator', 'a', 'intermediate_data', 10)
+    start = time.perf_counter()
+    assert broker.wait('aggregator', ['a'], 'intermediate_data', timeout=5) is False
+    assert time.perf_counter() - start < 0.1
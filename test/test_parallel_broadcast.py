@@ -0,0 +1,108 @@
+import math
+import time
+from typing import Any, Optional
+from flame.star import StarModel, StarModelTester, StarAnalyzer, StarAggregator
+
+
+SENDS = []  # (receivers, failed receivers, payload) of every send of the aggregator
+BROADCASTS = []  # (attempts per receiver, duration in seconds, sends) of every broadcast of the aggregator
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        analysis_result = sum(data) / len(data) \
+            if aggregator_results is None \
+            else (sum(data) / len(data) + aggregator_results) + 1 / 2
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MyAggregator(StarAggregator):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        result = sum(analysis_results) / len(analysis_results)
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result}", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        return self.num_iterations >= 5  # Limit to 5 iterations for testing
+
+
+class RecordingStarModel(StarModel):
+    def _start_aggregator(self, *args, **kwargs):
+        send_intermediate_data = self.flame.send_intermediate_data
+
+        def recording_send(receivers, data, *send_args, **send_kwargs):
+            successful, failed = send_intermediate_data(receivers, data, *send_args, **send_kwargs)
+            SENDS.append((list(receivers), list(failed), data))
+            return successful, failed
+
+        self.flame.send_intermediate_data = recording_send
+        super()._start_aggregator(*args, **kwargs)
+
+    def _send(self, receivers, payload):
+        if not self._is_aggregator():
+            return super()._send(receivers, payload)
+        num_sends, start = len(SENDS), time.perf_counter()
+        attempts = super()._send(receivers, payload)
+        BROADCASTS.append((attempts, time.perf_counter() - start, SENDS[num_sends:]))
+        return attempts
+
+
+if __name__ == "__main__":
+    data_splits = [[i, i + 1, i + 2, i + 3] for i in range(0, 32, 4)]
+    send_latency = 0.05
+
+    for model_kwargs, send_failure_rate in [({'broadcast_workers': 8, 'send_attempts': 8}, 0.2),
+                                            ({'broadcast_workers': 1, 'send_attempts': 8}, 0.2),
+                                            ({'broadcast_workers': 4}, 0),
+                                            ({'broadcast_workers': 1}, 0)]:
+        SENDS.clear()
+        BROADCASTS.clear()
+        tester = StarModelTester(data_splits=data_splits,            # TODO: Insert your data fragments in a list
+                                 analyzer=MyAnalyzer,                # TODO: Replace with your custom Analyzer class
+                                 aggregator=MyAggregator,            # TODO: Replace with your custom Aggregator class
+                                 data_type='s3',                     # TODO: Specify data type ('fhir' or 's3')
+                                 simple_analysis=False,
+                                 model_kwargs=model_kwargs,          # Send to analyzers concurrently, and resend to
+                                                                     # those, for which sending failed
+                                 mock_kwargs={'send_latency': send_latency,  # Simulated latency per sent message
+                                              'send_failure_rate': send_failure_rate},  # Probability of failed sends
+                                 model_class=RecordingStarModel)
+
+        assert not tester.errors, tester.errors
+        assert tester.result == 95.5, tester.result
+        assert len(BROADCASTS) == 5, len(BROADCASTS)  # one broadcast per aggregation, but the final one
+        analyzers = sorted(BROADCASTS[0][0].keys())
+        assert len(analyzers) == len(data_splits), analyzers
+        for attempts, duration, sends in BROADCASTS:
+            # the aggregated result was encoded once, all sends (and resends) share the same buffer
+            assert isinstance(sends[0][2], bytes), type(sends[0][2])
+            assert all(payload is sends[0][2] for _, _, payload in sends), sends
+
+            # every receiver was attempted once, plus once per failed attempt, until sending succeeded
+            for analyzer in analyzers:
+                analyzer_sends = [analyzer in failed for receivers, failed, _ in sends if analyzer in receivers]
+                assert attempts[analyzer] == len(analyzer_sends), (analyzer, attempts, analyzer_sends)
+                assert analyzer_sends == [True] * (len(analyzer_sends) - 1) + [False], (analyzer, analyzer_sends)
+
+            if model_kwargs['broadcast_workers'] > 1:
+                assert all(len(receivers) == 1 for receivers, _, _ in sends), sends
+            else:
+                # bulk sends, only receivers for which sending failed were resent to
+                assert sorted(sends[0][0]) == analyzers, sends
+                assert all(receivers == previous_failed
+                           for (receivers, _, _), (_, previous_failed, _) in zip(sends[1:], sends)), sends
+
+            if not send_failure_rate:
+                # sends of every worker overlap, a broadcast takes send_latency per receiver and worker
+                num_sequential = math.ceil(len(analyzers) / model_kwargs['broadcast_workers'])
+                assert send_latency * num_sequential <= duration < send_latency * (num_sequential + 1.5), duration
+
+        if send_failure_rate:
+            assert any(max(attempts.values()) > 1 for attempts, _, _ in BROADCASTS), BROADCASTS
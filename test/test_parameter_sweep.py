@@ -0,0 +1,90 @@
+import math
+from typing import Any, Optional
+from flame.star import StarModelSweep, StarAnalyzer, StarAggregator
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame, learning_rate: float = 0.5):
+        super().__init__(flame)
+        self.learning_rate = learning_rate
+
+    def analysis_method(self, data, aggregator_results):
+        model = 0.0 if aggregator_results is None else aggregator_results
+        analysis_result = model + self.learning_rate * (sum(data) / len(data) - model)
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MyCountingAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        # Count the analyses within the datasource, which is not shared with concurrent runs
+        data[0]['analyses'] = data[0].get('analyses', 0) + 1
+        analysis_result = data[0]['analyses'] + sum(data[0]['values']) / len(data[0]['values'])
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MyAggregator(StarAggregator):
+    def __init__(self, flame, max_iterations: int = 5):
+        super().__init__(flame)
+        self.max_iterations = max_iterations
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        result = sum(analysis_results) / len(analysis_results)
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result}", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        return self.num_iterations >= self.max_iterations
+
+
+if __name__ == "__main__":
+    data_splits = {'two_nodes': [[1, 2, 3, 4], [5, 6, 7, 8]],                  # TODO: Insert your named data splits
+                   'four_nodes': [[1, 2], [3, 4], [5, 6], [7, 8]]}
+
+    sweep = StarModelSweep(data_splits=data_splits,
+                           analyzer=MyAnalyzer,                                # TODO: Replace with your Analyzer class
+                           aggregator=MyAggregator,                            # TODO: Replace with your Aggregator class
+                           data_type='s3',                                     # TODO: Specify data type ('fhir' or 's3')
+                           configurations={                                    # Grid of StarModelTester arguments
+                               'analyzer_kwargs': [{'learning_rate': 0.5}, {'learning_rate': 0.9}],
+                               'aggregator_kwargs': [{'max_iterations': 3}, {'max_iterations': 10}],
+                           },
+                           max_workers=4,                                      # Number of concurrent simulations
+                           simple_analysis=False)
+    print(f"Final result: {[round(result, 4) for result in sweep.results.column('result')]}")
+
+    # One row per configuration and named data splits, every run converging towards the global mean (4.5) by the
+    # learning rate in every round (max_iterations + 1 rounds, starting from 0)
+    assert len(sweep.results) == 2 * 2 * len(data_splits), sweep.results
+    assert sorted(sweep.results.column('run')) == list(range(len(sweep.results))), sweep.results
+    rows = {(row['data_splits'], row['analyzer_kwargs']['learning_rate'], row['aggregator_kwargs']['max_iterations'])
+            for row in sweep.results}
+    assert rows == {(name, learning_rate, max_iterations) for name in data_splits for learning_rate in [0.5, 0.9]
+                    for max_iterations in [3, 10]}, rows
+    for row in sweep.results:
+        assert row['error'] is None, row
+        learning_rate = row['analyzer_kwargs']['learning_rate']
+        expected = 4.5 * (1 - (1 - learning_rate) ** (row['aggregator_kwargs']['max_iterations'] + 1))
+        assert math.isclose(row['result'], expected, rel_tol=1e-9), (row, expected)
+
+    # Runs add to their datasources without interfering with concurrent runs or the given data splits, while the
+    # datasets themselves are shared between runs
+    values_1, values_2 = [1, 2, 3, 4], [5, 6, 7, 8]
+    data_splits = [[{'values': values_1}], [{'values': values_2}]]
+    sweep = StarModelSweep(data_splits=data_splits,
+                           analyzer=MyCountingAnalyzer,                    # TODO: Replace with your Analyzer class
+                           aggregator=MyAggregator,                        # TODO: Replace with your Aggregator class
+                           data_type='s3',                                 # TODO: Specify data type ('fhir' or 's3')
+                           configurations={'aggregator_kwargs': [{'max_iterations': 3}] * 4},
+                           max_workers=4,                                  # Number of concurrent simulations
+                           simple_analysis=False,
+                           quiet=True)
+    assert sweep.results.column('error') == [None] * 4, sweep.results
+    assert sweep.results.column('result') == [4 + 4.5] * 4, sweep.results  # 4th analysis of every node
+    assert data_splits == [[{'values': values_1}], [{'values': values_2}]], data_splits
+    assert StarModelSweep._copy_splits(data_splits, deep=False)[0][0]['values'] is values_1
+    assert StarModelSweep._copy_splits(data_splits, deep=True)[0][0]['values'] is not values_1
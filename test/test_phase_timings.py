@@ -0,0 +1,77 @@
+import time
+from typing import Any, Optional
+from flame.star import StarModelTester, StarAnalyzer, StarAggregator
+
+
+NODES = {}  # node objects by id, to inspect their timing records after the simulation
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        NODES[self.id] = self
+        time.sleep(0.05)  # Simulate a slow analysis, which shows up in the 'analysis' phase of every iteration
+        analysis_result = sum(data) / len(data) \
+            if aggregator_results is None \
+            else (sum(data) / len(data) + aggregator_results) + 1 / 2
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MyAggregator(StarAggregator):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        NODES[self.id] = self
+        result = sum(analysis_results) / len(analysis_results)
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result}", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        # Timing records of completed iterations are available on the node objects
+        for record in self.timings[-1:]:
+            self.flame.flame_log(f"\tPhases of iteration {record.iteration}: {list(record.phases.keys())}",
+                                 log_type='notice')
+        return self.num_iterations >= 3  # Limit to 3 iterations for testing
+
+
+if __name__ == "__main__":
+    data_1 = [1, 2, 3, 4]
+    data_2 = [5, 6, 7, 8]
+    data_splits = [data_1, data_2]
+
+    tester = StarModelTester(data_splits=data_splits,                # TODO: Insert your data fragments in a list
+                             analyzer=MyAnalyzer,                    # TODO: Replace with your custom Analyzer class
+                             aggregator=MyAggregator,                # TODO: Replace with your custom Aggregator class
+                             data_type='s3',                         # TODO: Specify data type ('fhir' or 's3')
+                             simple_analysis=False,
+                             model_kwargs={'log_timings': True})     # Log the time spent per phase in every iteration
+
+    # Every node recorded the phases of each of its iterations, and the payloads it sent and received
+    assert not tester.errors, tester.errors
+    assert tester.result == 19.5, tester.result
+    analyzers = [node for node in NODES.values() if isinstance(node, MyAnalyzer)]
+    aggregators = [node for node in NODES.values() if isinstance(node, MyAggregator)]
+    assert (len(analyzers) == len(data_splits)) and (len(aggregators) == 1), NODES
+    for node in NODES.values():
+        assert [record.iteration for record in node.timings] == [0, 1, 2, 3], node.timings
+        assert all((record.end is not None) and (record.duration >= sum(record.phases.values()) - 1e-3)
+                   for record in node.timings), [record.to_dict() for record in node.timings]
+        assert 'ready_check' in node.timings[0].phases
+    for analyzer in analyzers:
+        assert 'data_loading' in analyzer.timings[0].phases
+        for record in analyzer.timings:
+            assert {'analysis', 'serialization', 'send', 'await_aggregated_result'} <= set(record.phases), record
+            assert record.phases['analysis'] >= 0.05, record
+            assert record.payload_sizes['sent'] > 0, record
+        assert all(record.payload_sizes['received'] > 0 for record in analyzer.timings[:-1])
+    for record in aggregators[0].timings:
+        assert {'await_intermediate_data', 'deserialization', 'aggregation', 'convergence_check'} <= set(record.phases)
+        assert record.phases['await_intermediate_data'] >= 0.04, record  # awaiting the slow analyses
+        assert record.payload_sizes['received'] > 0, record
+        final = record.iteration == 3
+        assert ('submit_final_result' in record.phases) == final, record
+        assert (('send' in record.phases) and (record.payload_sizes['sent'] > 0)) != final, record
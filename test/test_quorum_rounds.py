@@ -0,0 +1,79 @@
+import time
+from typing import Any, Optional
+from flame.star import StarModelTester, StarAnalyzer, StarAggregator
+from flame.star.star_model import _STREAM_POLL_INTERVAL
+
+
+ROUNDS = []  # (time, number of contributors) of every round closed by the aggregator
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        self.flame.flame_log(f"\tAggregator results in MyAnalyzer: {aggregator_results}", log_type='debug')
+        if 9 in data:
+            time.sleep(1.5)  # Simulate a straggling node
+        analysis_result = sum(data) / len(data) \
+            if aggregator_results is None \
+            else (sum(data) / len(data) + aggregator_results) / 2
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MyAggregator(StarAggregator):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        self.flame.flame_log(f"\tAnalysis results in MyAggregator from {len(self.contributor_ids)}/"
+                             f"{len(self.partner_node_ids)} analyzers: {analysis_results}", log_type='notice')
+        ROUNDS.append((time.monotonic(), len(self.contributor_ids)))
+        result = sum(analysis_results) / len(analysis_results)
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result}", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        self.flame.flame_log(f"\tLast result: {last_result}, Current result: {result}", log_type="notice")
+        self.flame.flame_log(f"\tChecking convergence at iteration {self.num_iterations}", log_type="notice")
+        return self.num_iterations >= 5  # Limit to 5 iterations for testing
+
+
+if __name__ == "__main__":
+    data_1 = [1, 2, 3, 4]
+    data_2 = [5, 6, 7, 8]
+    data_3 = [9, 10, 11, 12]
+    data_splits = [data_1, data_2, data_3]
+
+    for model_kwargs in [{'quorum': 2,                      # Close each round after 2 of 3 results ...
+                          'round_timeout': 1,               # ... or after 1 second
+                          'late_results': 'drop'},          # Drop results arriving after their round was closed
+                         {'quorum': 2,
+                          'round_timeout': 1,
+                          'poll_interval': 0.3},            # Check for arrived results every 0.3 seconds
+                         {'round_timeout': 0.5}]:           # Close each round after 0.5 seconds (without quorum)
+        ROUNDS.clear()
+        tester = StarModelTester(data_splits=data_splits,            # TODO: Insert your data fragments in a list
+                                 analyzer=MyAnalyzer,                # TODO: Replace with your custom Analyzer class
+                                 aggregator=MyAggregator,            # TODO: Replace with your custom Aggregator class
+                                 data_type='s3',                     # TODO: Specify data type ('fhir' or 's3')
+                                 simple_analysis=False,
+                                 model_kwargs=model_kwargs)
+
+        # Every round closed without the straggler, at the first check for arrived results after the quorum was reached
+        # (awaits return once all awaited results arrived or the poll interval expired) or once the round timed out
+        assert not tester.errors, tester.errors
+        assert len(ROUNDS) == 6, ROUNDS
+        assert all(num_contributors == 2 for _, num_contributors in ROUNDS), ROUNDS
+        round_durations = [later - earlier for (earlier, _), (later, _) in zip(ROUNDS, ROUNDS[1:])]
+        if 'quorum' in model_kwargs:
+            poll_interval = model_kwargs.get('poll_interval', _STREAM_POLL_INTERVAL)
+            assert max(round_durations) < poll_interval + 0.2, \
+                f"Rounds closed after {round_durations} despite the quorum"
+            # (rounds only close earlier, if a late result of the straggler completes the awaited results)
+            assert sorted(round_durations)[len(round_durations) // 2] > poll_interval * 0.9, \
+                f"Rounds closed after {round_durations} before the poll interval expired"
+        else:
+            assert all(0.45 < duration < 0.8 for duration in round_durations), \
+                f"Rounds closed after {round_durations} instead of the round timeout"
@@ -0,0 +1,57 @@
+import os
+from typing import Any, Optional
+
+import numpy as np
+
+from flame.star import StarModelTester, StarAnalyzer, FedAvgAggregator
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        # Large model state (8 MB), passed between nodes through shared memory instead of being copied by the broker
+        weights = np.full(1_000_000, float(sum(data) / len(data)))
+        if aggregator_results is not None:
+            weights = (weights + aggregator_results['weights']) / 2
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {weights[0]}", log_type='notice')
+        return {'weights': weights, 'n_samples': len(data)}
+
+
+class MyAggregator(FedAvgAggregator):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result['weights'][0]}", log_type='notice')
+        return self.num_iterations >= 3  # Limit to 3 iterations for testing
+
+
+if __name__ == "__main__":
+    data_1 = [1, 2, 3, 4]
+    data_2 = [5, 6, 7, 8]
+    data_3 = [9, 10, 11, 12]
+    data_splits = [data_1, data_2, data_3]
+
+    segments_before = set(os.listdir('/dev/shm'))
+    results = {}
+    for message_transport in ['shared_memory', 'reference']:
+        tester = StarModelTester(data_splits=data_splits,            # TODO: Insert your data fragments in a list
+                                 analyzer=MyAnalyzer,                # TODO: Replace with your custom Analyzer class
+                                 aggregator=MyAggregator,            # TODO: Replace with your custom Aggregator class
+                                 data_type='s3',                     # TODO: Specify data type ('fhir' or 's3')
+                                 simple_analysis=False,
+                                 output_type='pickle',
+                                 backend='process',                  # Run every node in its own process
+                                 mock_kwargs={'message_transport': message_transport,  # Pass handles to shared
+                                                                                       # memory segments
+                                              'report_message_sizes': True})  # Log encoded sizes of sent messages
+        assert not tester.errors, (message_transport, tester.errors)
+        results[message_transport] = tester.result
+
+    # Every shared memory segment was removed by its last reader, and the result does not depend on the transport
+    leaked_segments = set(os.listdir('/dev/shm')) - segments_before
+    assert not leaked_segments, leaked_segments
+    assert results['shared_memory'].keys() == results['reference'].keys(), results
+    assert np.array_equal(results['shared_memory']['weights'], results['reference']['weights']), results
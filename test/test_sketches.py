@@ -0,0 +1,92 @@
+import math
+from typing import Any, Optional
+import numpy as np
+from flame.star import StarModelTester, StarAnalyzer, StarAggregator
+from flame.utils.sketches import CategoricalSketch, CountSketch, HistogramSketch, MomentsSketch, QuantileSketch
+
+
+EDGES = list(range(0, 101, 10))
+K = 200
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        # summarize local data in a single pass, only the sketches are sent to the aggregator
+        values = data[0]['values']
+        analysis_result = {'count': CountSketch().update(values),
+                           'moments': MomentsSketch().update(values),
+                           'histogram': HistogramSketch(edges=EDGES).update(values),
+                           'quantiles': QuantileSketch(k=K, seed=0).update(values),
+                           'categories': CategoricalSketch().update(data[0]['categories'])}
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): mean={analysis_result['moments'].mean}",
+                             log_type='notice')
+        return analysis_result
+
+
+class MyAggregator(StarAggregator):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def aggregation_method(self, analysis_results: list[Any]) -> Any:
+        result = {name: type(analysis_results[0][name]).merge_all(r[name] for r in analysis_results)
+                  for name in analysis_results[0].keys()}
+        self.flame.flame_log(f"MyAggregator result ({self.id}): mean={result['moments'].mean}, "
+                             f"median={result['quantiles'].quantile(0.5)}", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        return True
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    data_1 = [{'values': rng.normal(50, 20, 20_000).tolist() + [None, float('nan')],
+               'categories': ['a', 'b', 'a', None]}]
+    data_2 = [{'values': rng.uniform(-10, 110, 30_000).tolist() + [np.float32('nan')],
+               'categories': ['b', 'c']}]
+    data_3 = [{'values': list(np.arange(100, dtype=np.float32)), 'categories': []}]
+    data_splits = [data_1, data_2, data_3]
+
+    tester = StarModelTester(data_splits=data_splits,                # TODO: Insert your data fragments in a list
+                             analyzer=MyAnalyzer,                    # TODO: Replace with your custom Analyzer class
+                             aggregator=MyAggregator,                # TODO: Replace with your custom Aggregator class
+                             data_type='s3',                         # TODO: Specify data type ('fhir' or 's3')
+                             simple_analysis=True)
+
+    # The merged sketches summarize the concatenated data of all analyzers
+    assert not tester.errors, tester.errors
+    result = tester.result
+    all_values = np.asarray([v for split in data_splits for v in split[0]['values']], dtype=np.float64)
+    values = all_values[~np.isnan(all_values)]
+
+    # missing values (None, float and numpy NaN) are counted separately
+    assert (result['count'].count, result['count'].missing) == (values.size, 3), vars(result['count'])
+    assert result['histogram'].missing == 3, result['histogram'].missing
+
+    # Chan-merged moments match the two-pass moments of the concatenated data
+    moments = result['moments']
+    assert moments.count == values.size, moments.count
+    assert math.isclose(moments.mean, values.mean(), rel_tol=1e-12), (moments.mean, values.mean())
+    assert math.isclose(moments.variance, values.var(ddof=1), rel_tol=1e-12), (moments.variance, values.var(ddof=1))
+    assert (moments.min, moments.max) == (values.min(), values.max()), (moments.min, moments.max)
+
+    # histogram edges and counts match numpy.histogram, values outside the edges are under- or overflows
+    histogram = result['histogram']
+    assert histogram.edges == [float(e) for e in EDGES], histogram.edges
+    assert histogram.counts == np.histogram(values, bins=EDGES)[0].tolist(), histogram.counts
+    assert histogram.underflow == int((values < EDGES[0]).sum()), histogram.underflow
+    assert histogram.overflow == int((values > EDGES[-1]).sum()), histogram.overflow
+
+    # quantiles of the merged KLL sketch are within the documented rank error (1.65/k) of the exact quantiles
+    quantiles = result['quantiles']
+    assert quantiles.count == values.size, quantiles.count
+    sorted_values = np.sort(values)
+    for q in [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]:
+        estimate = quantiles.quantile(q)
+        rank = np.searchsorted(sorted_values, estimate, side='right') / values.size
+        assert abs(rank - q) <= 1.65 / K, (q, estimate, np.quantile(values, q), rank)
+
+    assert result['categories'].counts == {'a': 2, 'b': 2, 'c': 1, None: 1}, result['categories'].counts
@@ -0,0 +1,105 @@
+import math
+from typing import Any, Optional
+from flame.star import StarModel, StarModelTester, StarAnalyzer, StarAggregator, StarTreeModel
+
+
+TREE = {}  # parent and children per node id, as arranged by the tree model
+PARTIALS = []  # (node, round, senders) of the partial results received by every node in every round
+TIMED = []  # whether folding its own result was timed as aggregation, for every analysis result of an analyzer
+
+
+class MyAnalyzer(StarAnalyzer):
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def analysis_method(self, data, aggregator_results):
+        analysis_result = sum(data) / len(data) \
+            if aggregator_results is None \
+            else (sum(data) / len(data) + aggregator_results) + 1 / 2
+        self.flame.flame_log(f"MyAnalysis result ({self.id}): {analysis_result}", log_type='notice')
+        return analysis_result
+
+
+class MyAggregator(StarAggregator):
+    incremental_aggregation = True  # (the star model reference folds the results as they arrive as well)
+
+    def __init__(self, flame):
+        super().__init__(flame)
+
+    def init_aggregation(self) -> Any:
+        return 0.0, 0
+
+    def accumulate(self, partial_result: Any, analysis_result: Any) -> Any:
+        total, count = partial_result
+        return total + analysis_result, count + 1
+
+    def merge_states(self, partial_result: Any, other_partial_result: Any) -> Any:
+        # Partial (sum, count) pairs of subtrees are merged on analyzers acting as sub-aggregators
+        self.flame.flame_log(f"\tMerging partial result of subtree in {self.id}: {other_partial_result}",
+                             log_type='notice')
+        return partial_result[0] + other_partial_result[0], partial_result[1] + other_partial_result[1]
+
+    def finalize_aggregation(self, partial_result: Any) -> Any:
+        total, count = partial_result
+        result = total / count
+        self.flame.flame_log(f"MyAggregator result ({self.id}): {result} (from {count} analyzers)", log_type='notice')
+        return result
+
+    def has_converged(self, result: Any, last_result: Optional[Any]) -> bool:
+        return self.num_iterations >= 5  # Limit to 5 iterations for testing
+
+
+class RecordingStarTreeModel(StarTreeModel):
+    def _stream_intermediate_data(self, senders, current_round):
+        TREE.update(self._tree())
+        received = []
+        for sender, result in super()._stream_intermediate_data(senders, current_round):
+            received.append(sender)
+            yield sender, result
+        PARTIALS.append((self.flame.get_id(), current_round, received))
+
+    def _send_analysis_result(self, aggregator_id, analyzer_res, current_round):
+        super()._send_analysis_result(aggregator_id, analyzer_res, current_round)
+        TIMED.append('aggregation' in self._timer.current.phases)
+
+
+def depth(node_id: str) -> int:
+    parent, _ = TREE[node_id]
+    return 0 if parent is None else depth(parent) + 1
+
+
+if __name__ == "__main__":
+    for num_analyzers, fan_in in [(7, 2), (9, 3)]:
+        data_splits = [[i, i + 1, i + 2, i + 3] for i in range(0, 4 * num_analyzers, 4)]
+
+        results = []
+        for model_class, model_kwargs in [(StarModel, {}),
+                                          (RecordingStarTreeModel, {'fan_in': fan_in})]:
+            TREE.clear()
+            PARTIALS.clear()
+            TIMED.clear()
+            tester = StarModelTester(data_splits=data_splits,        # TODO: Insert your data fragments in a list
+                                     analyzer=MyAnalyzer,            # TODO: Replace with your custom Analyzer class
+                                     aggregator=MyAggregator,        # TODO: Replace with your custom Aggregator class
+                                     data_type='s3',                 # TODO: Specify data type ('fhir' or 's3')
+                                     simple_analysis=False,
+                                     model_class=model_class,        # Aggregate along a tree instead of a star ...
+                                     model_kwargs=model_kwargs)      # ... every node receives at most fan_in results
+            assert not tester.errors, tester.errors
+            results.append(tester.result)
+
+        # The tree aggregates the same result as the star (up to the order of floating point additions)
+        assert math.isclose(results[0], results[1], rel_tol=1e-12), results
+
+        # Every node received the partial results of all of its children (at most fan_in) in every round, along a
+        # tree of the minimal depth
+        assert len(TREE) == num_analyzers + 1, TREE
+        assert all(sorted(senders) == sorted(TREE[node_id][1]) for node_id, _, senders in PARTIALS), PARTIALS
+        assert max(len(senders) for _, _, senders in PARTIALS) == fan_in, PARTIALS
+        assert {node_id for node_id, _, _ in PARTIALS} == {node_id for node_id, (_, children) in TREE.items()
+                                                          if children}, (PARTIALS, TREE)
+        tree_depth = max(depth(node_id) for node_id in TREE)
+        assert tree_depth == next(d for d in range(1, num_analyzers + 1) if fan_in ** d >= num_analyzers), tree_depth
+
+        # folding the own result into the partial result is timed as aggregation on every analyzer
+        assert len(TIMED) == 6 * num_analyzers and all(TIMED), TIMED